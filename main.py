@@ -8,46 +8,51 @@ results to Google's Gemini API for further processing.
 """
 
 import sys
+import atexit
 import argparse
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 
+from dotenv import load_dotenv
+
+# Load environment variables (e.g. GEMINI_API_KEY) once, before any pipeline module reads them
+load_dotenv()
+
 # Add src directory to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.pipeline import AudioTranscriptionPipeline
-
-# Import output file patterns from a central constants module
-try:
-    from src.constants import OUTPUT_FILE_PATTERNS
-except ImportError:
-    # Fallback if constants.py does not exist yet
-    OUTPUT_FILE_PATTERNS = [
-        "{audio_name}_converted.wav (converted audio)",
-        "{audio_name}_transcription.txt (plain text transcription)",
-        "{audio_name}_transcription_detailed.json (detailed transcription data)",
-        "{audio_name}_api_response_YYYYMMDD_HHMMSS.json (Gemini API response)",
-        "{audio_name}_api_response_YYYYMMDD_HHMMSS.txt (API response text)",
-        "{audio_name}_translation.txt (Tamil translation)",
-        "{audio_name}_translation_detailed.json (detailed translation data)",
-        "{audio_name}_tamil_speech_YYYYMMDD_HHMMSS.mp3 (Tamil audio output)",
-        "{audio_name}_tamil_speech_metadata.json (TTS metadata)",
-        "{audio_name}_pipeline_summary.json (execution summary)",
-        "pipeline.log (detailed execution log)"
-    ]
+from src.constants import OUTPUT_FILE_PATTERNS
 
 
 def setup_logging(verbose: bool = False):
-    """Setup logging configuration."""
+    """
+    Setup logging configuration.
+    
+    Log calls only enqueue the record; a background listener thread does the
+    formatting and the writes to pipeline.log and the console.
+    """
     level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('pipeline.log'),
-            logging.StreamHandler()
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler('pipeline.log'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Stopping the listener flushes any queued records on exit
+    atexit.register(listener.stop)
+    
+    # The listener's handlers apply the real format; queued records carry only the message
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[queue_handler])
 
 
 def main():
@@ -59,9 +64,13 @@ def main():
 Examples:
   python main.py                    # Process all audio files in audio/ directory
   python main.py --file audio2.mp3  # Process specific file
+  python main.py --parallel 4       # Transcribe up to 4 files at once
   python main.py --verbose          # Enable verbose logging
+  python main.py --refresh-cache    # Re-transcribe, re-query the API and regenerate speech instead of using cached results
   python main.py --help             # Show this help message
-        """
+
+Output files (in the output directory):
+""" + "\n".join(f"  {pattern}" for pattern in OUTPUT_FILE_PATTERNS)
     )
     
     parser.add_argument(
@@ -84,6 +93,25 @@ Examples:
         help='Output directory for results (default: output)'
     )
     
+    parser.add_argument(
+        '--parallel', '-p',
+        type=int,
+        metavar='N',
+        help='Worker processes for batch transcription (default: half the CPU cores, or 1 on a GPU; 1 disables)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write cached transcriptions, API responses and speech audio'
+    )
+    
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Ignore cached transcriptions, API responses and speech audio but store fresh ones'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -102,11 +130,14 @@ Examples:
     setup_logging(args.verbose)
     logger = logging.getLogger(__name__)
     
+    pipeline = None
     try:
         # Initialize pipeline
         pipeline = AudioTranscriptionPipeline(
             input_dir=args.input_dir,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            use_cache=not args.no_cache,
+            refresh_cache=args.refresh_cache
         )
         
         # Process files
@@ -134,7 +165,7 @@ Examples:
                 print("  - GEMINI_API_KEY is set in .env file")
                 print("  - FFmpeg is installed and accessible")
                 return 1
-            results = pipeline.process_all_files()
+            results = pipeline.process_all_files(max_workers=args.parallel)
             successful = sum(1 for v in results.values() if v)
             total = len(results)
             # Only print summary if files were processed
@@ -153,6 +184,10 @@ Examples:
         print(f"❌ Unexpected error: {e}")
         return 1
 
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
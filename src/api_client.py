@@ -11,33 +11,45 @@ Handles communication with Google Gemini API:
 
 import os
 import logging
+import hashlib
+import queue
+import threading
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
+import re
 import time
+import random
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
-from datetime import datetime
-from dotenv import load_dotenv
-
-# Load environment variables
-try:
-    load_dotenv()
-except:
-    pass  # Continue without .env file
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+# Delimiters used when several transcriptions share one API request
+BATCH_BEGIN_MARKER = "---BEGIN {index}---"
+BATCH_END_MARKER = "---END {index}---"
+BATCH_SECTION_RE = re.compile(r"---BEGIN (\d+)---\s*(.*?)\s*---END \1---", re.DOTALL)
+
 
 class GeminiAPIClient:
     """Handles communication with Google Gemini API."""
     
-    def __init__(self, output_dir: str = "output"):
+    # Directories already created by any client in this process
+    _created_dirs = set()
+    _created_dirs_lock = threading.Lock()
+    
+    def __init__(self, output_dir: str = "output", use_cache: bool = True, refresh_cache: bool = False):
         """
         Initialize the Gemini API client.
         
         Args:
             output_dir: Directory for API response outputs
+            use_cache: Whether to read and write the on-disk response cache
+            refresh_cache: Ignore cached responses but still store fresh ones
         """
         self.api_key = os.getenv('GEMINI_API_KEY')
         self.api_url = os.getenv('GEMINI_API_URL', 'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent')
@@ -49,12 +61,114 @@ class GeminiAPIClient:
         self.max_retries = 3
         self.retry_delay = 1  # seconds
         self.rate_limit_delay = 2  # seconds between requests
+        self.max_retry_delay = 60  # seconds; longer Retry-After values are capped
+        
+        # Prompts longer than this are rejected before upload instead of
+        # spending bandwidth and a rate-limit slot on a guaranteed API error
+        self.max_prompt_chars = int(os.getenv('GEMINI_MAX_PROMPT_CHARS', '30000'))
+        
+        # Response cache settings (content-addressed by API URL + prompt text)
+        self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
+        self.cache_dir = self.output_dir / ".gemini_cache"
+        self.cache_ttl = 7 * 86400  # seconds
+        
+        # Persistent HTTP session so consecutive requests reuse the same
+        # keep-alive connection instead of a fresh TCP/TLS handshake each time.
+        # All requests go to a single host, so one pool is enough; blocking when
+        # it is exhausted keeps concurrent callers on the pooled sockets rather
+        # than opening throwaway connections. Retries stay disabled at the
+        # adapter level; make_api_request owns them.
+        self.max_connections = 16
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_connections,
+            pool_block=True,
+            max_retries=0
+        ))
+        self._session.headers.update({
+            'Content-Type': 'application/json',
+            'X-goog-api-key': self.api_key or ''
+        })
+        
+        # Response files are written by a background thread so saving never
+        # blocks the thread that is waiting on the next API request
+        self._io_queue = queue.Queue()
+        self._io_thread = None
+        self._io_lock = threading.Lock()
+        self._failed_writes = []
         
         if not self.api_key:
             logger.error("GEMINI_API_KEY not found in environment variables")
         else:
             logger.info("Gemini API client initialized successfully")
     
+    def close(self) -> List[Path]:
+        """
+        Finish pending file writes, then close the HTTP session and release pooled connections.
+        
+        Returns:
+            List[Path]: Response files that could not be written since the previous flush
+        """
+        failed_writes = self.flush()
+        with self._io_lock:
+            io_thread, self._io_thread = self._io_thread, None
+        if io_thread is not None:
+            self._io_queue.put(None)  # tells the writer thread to exit
+            io_thread.join()
+        self._session.close()
+        return failed_writes
+    
+    def flush(self) -> List[Path]:
+        """
+        Block until every queued response file has been written.
+        
+        Returns:
+            List[Path]: Response files that could not be written since the previous flush
+        """
+        self._io_queue.join()
+        with self._io_lock:
+            failed_writes, self._failed_writes = self._failed_writes, []
+        return failed_writes
+    
+    def _io_worker(self) -> None:
+        """Write queued (path, bytes) pairs to disk until close() queues None."""
+        while True:
+            item = self._io_queue.get()
+            if item is None:
+                self._io_queue.task_done()
+                return
+            path, data = item
+            try:
+                path.write_bytes(data)
+            except OSError as e:
+                logger.error(f"Failed to write API response file {path}: {e}")
+                with self._io_lock:
+                    self._failed_writes.append(path)
+            finally:
+                self._io_queue.task_done()
+    
+    def _enqueue_write(self, path: Path, data: bytes) -> None:
+        """
+        Queue a file write for the background writer thread.
+        
+        Args:
+            path: Destination file path
+            data: File contents
+        """
+        with self._io_lock:
+            if self._io_thread is None:
+                self._io_thread = threading.Thread(target=self._io_worker, name="api-response-writer", daemon=True)
+                self._io_thread.start()
+        self._io_queue.put((path, data))
+    
+    def __enter__(self) -> "GeminiAPIClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
     def validate_api_key(self) -> bool:
         """
         Validate the API key.
@@ -70,7 +184,7 @@ class GeminiAPIClient:
             logger.error("API key appears to be invalid (too short)")
             return False
         
-        logger.info("API key validation passed")
+        logger.debug("API key validation passed")
         return True
     
     def format_request(self, text: str) -> Dict[str, Any]:
@@ -95,9 +209,114 @@ class GeminiAPIClient:
             ]
         }
         
-        logger.info(f"Request formatted for text length: {len(text)} characters")
+        logger.debug("Request formatted for text length: %d characters", len(text))
         return request_payload
     
+    def _cache_key(self, text: str) -> str:
+        """
+        Build the response cache key for a prompt.
+        
+        Args:
+            text: Prompt text sent to the API
+            
+        Returns:
+            str: Hex digest identifying the (API URL, text) pair
+        """
+        return hashlib.blake2b((self.api_url + "\0" + text).encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _load_cached_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached API response if present and not expired.
+        
+        Args:
+            key: Cache key from _cache_key()
+            
+        Returns:
+            Optional[Dict[str, Any]]: Cached API response or None on miss
+        """
+        cache_path = self.cache_dir / f"{key}.json"
+        try:
+            if time.time() - cache_path.stat().st_mtime > self.cache_ttl:
+                return None
+            return orjson.loads(cache_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+    
+    @classmethod
+    def _ensure_dir(cls, path: Path) -> None:
+        """
+        Create a directory the first time it is needed in this process.
+        
+        Args:
+            path: Directory to create
+        """
+        if path in cls._created_dirs:
+            return
+        with cls._created_dirs_lock:
+            if path not in cls._created_dirs:
+                path.mkdir(parents=True, exist_ok=True)
+                cls._created_dirs.add(path)
+    
+    def _store_cached_response(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Store an API response in the on-disk cache.
+        
+        Args:
+            key: Cache key from _cache_key()
+            response: Raw API response to cache
+        """
+        cache_path = self.cache_dir / f"{key}.json"
+        tmp_path = cache_path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self._ensure_dir(self.cache_dir)
+            tmp_path.write_bytes(orjson.dumps(response, option=orjson.OPT_NON_STR_KEYS))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to cache API response: {e}")
+    
+    def _backoff_delay(self, attempt: int, base_delay: float, retry_after: Optional[str] = None) -> float:
+        """
+        Compute how long to wait before retrying a failed request.
+        
+        Uses the server's Retry-After header when present, otherwise exponential
+        backoff, capped at max_retry_delay so one response cannot stall a pool
+        thread for an hour. Up to 20% random jitter is added so concurrent
+        requests that failed together do not all retry at the same instant.
+        
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            base_delay: Delay before the first retry, in seconds
+            retry_after: Value of the Retry-After response header, if any
+            
+        Returns:
+            float: Delay in seconds
+        """
+        delay = base_delay * (2 ** attempt)
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        delay = min(max(0.0, delay), self.max_retry_delay)
+        return delay + random.uniform(0, delay * 0.2)
+    
+    def _read_error_snippet(self, response: requests.Response, limit: int = 512) -> str:
+        """
+        Read the start of an error response body for logging.
+        
+        Args:
+            response: Streamed response with a non-200 status
+            limit: Maximum number of bytes to read
+            
+        Returns:
+            str: Up to limit bytes of the body, decoded as UTF-8
+        """
+        snippet = next(response.iter_content(chunk_size=limit), b'')
+        return snippet[:limit].decode('utf-8', errors='replace')
+    
     def make_api_request(self, text: str) -> Optional[Dict[str, Any]]:
         """
         Make API request to Gemini with retry logic.
@@ -111,60 +330,80 @@ class GeminiAPIClient:
         if not self.validate_api_key():
             return None
         
-        request_payload = self.format_request(text)
+        if len(text) > self.max_prompt_chars:
+            logger.error(f"Prompt is too long ({len(text)} characters, limit {self.max_prompt_chars}); not sending request")
+            return None
         
-        headers = {
-            'Content-Type': 'application/json',
-            'X-goog-api-key': self.api_key  # <-- Use this instead of Authorization
-        }
+        cache_key = self._cache_key(text) if self.use_cache else None
+        if cache_key and not self.refresh_cache:
+            cached_response = self._load_cached_response(cache_key)
+            if cached_response is not None:
+                logger.debug("Using cached API response")
+                return cached_response
+        
+        request_payload = self.format_request(text)
         
         for attempt in range(self.max_retries):
             try:
-                logger.info(f"Making API request (attempt {attempt + 1}/{self.max_retries})")
+                logger.debug("Making API request (attempt %d/%d)", attempt + 1, self.max_retries)
                 
-                response = requests.post(
+                response = self._session.post(
                     self.api_url,
-                    headers=headers,
                     json=request_payload,
-                    timeout=30  # 30 second timeout
+                    timeout=30,  # 30 second timeout
+                    stream=True  # read the body only once the status is known
                 )
+                try:
+                    status_code = response.status_code
+                    if status_code == 200:
+                        api_response = orjson.loads(response.content)
+                    else:
+                        retry_after = response.headers.get('Retry-After')
+                        error_body = self._read_error_snippet(response)
+                finally:
+                    response.close()
                 
                 # Handle different response status codes
-                if response.status_code == 200:
-                    logger.info("API request successful")
-                    return response.json()
+                if status_code == 200:
+                    logger.debug("API request successful")
+                    if cache_key:
+                        self._store_cached_response(cache_key, api_response)
+                    return api_response
                 
-                elif response.status_code == 429:  # Rate limited
-                    logger.warning(f"Rate limited (attempt {attempt + 1}). Waiting {self.rate_limit_delay * (attempt + 1)} seconds...")
-                    time.sleep(self.rate_limit_delay * (attempt + 1))
-                    continue
+                elif status_code == 429:  # Rate limited
+                    if attempt < self.max_retries - 1:
+                        delay = self._backoff_delay(attempt, self.rate_limit_delay, retry_after)
+                        logger.warning(f"Rate limited (attempt {attempt + 1}). Waiting {delay:.1f} seconds...")
+                        time.sleep(delay)
+                        continue
+                    logger.warning(f"Rate limited (attempt {attempt + 1})")
                 
-                elif response.status_code == 401:  # Unauthorized
+                elif status_code == 401:  # Unauthorized
                     logger.error("API key is invalid or expired")
                     return None
                 
-                elif response.status_code == 400:  # Bad request
-                    logger.error(f"Bad request: {response.text}")
+                elif status_code == 400:  # Bad request
+                    logger.error(f"Bad request: {error_body}")
                     return None
                 
                 else:
-                    logger.error(f"API request failed with status {response.status_code}: {response.text}")
+                    logger.error(f"API request failed with status {status_code}: {error_body}")
                     if attempt < self.max_retries - 1:
-                        time.sleep(self.retry_delay)
+                        time.sleep(self._backoff_delay(attempt, self.retry_delay))
                         continue
                     return None
                 
             except requests.exceptions.Timeout:
                 logger.error(f"Request timeout (attempt {attempt + 1})")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._backoff_delay(attempt, self.retry_delay))
                     continue
                 return None
                 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, ValueError) as e:
                 logger.error(f"Request failed: {e}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._backoff_delay(attempt, self.retry_delay))
                     continue
                 return None
         
@@ -212,7 +451,7 @@ class GeminiAPIClient:
                 'prompt_feedback': response.get('promptFeedback', {})
             }
             
-            logger.info(f"API response parsed successfully. Generated text length: {len(generated_text)} characters")
+            logger.debug("API response parsed successfully. Generated text length: %d characters", len(generated_text))
             return parsed_response
             
         except Exception as e:
@@ -223,48 +462,66 @@ class GeminiAPIClient:
         """
         Save API response to file with unique filenames.
         
+        Files are written by a background thread; call flush() (or close())
+        before relying on them being on disk. flush() also reports the files
+        whose writes failed.
+        
         Args:
             response: API response to save
             base_filename: Base filename for outputs (will be used to generate unique filenames)
             
         Returns:
-            bool: True if saved successfully, False otherwise
+            bool: True if both files were queued for writing, False otherwise
         """
         try:
-            # Generate unique filenames
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Generate unique filenames sharing one timestamped stem; microseconds
+            # keep concurrent saves for the same base from overwriting each other
+            file_stem = f"{base_filename}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
             
             # Save JSON response
-            json_filename = f"{base_filename}_{timestamp}.json"
-            output_path = self.output_dir / json_filename
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(response, f, indent=2, ensure_ascii=False)
+            output_path = self.output_dir / f"{file_stem}.json"
+            self._enqueue_write(output_path, orjson.dumps(response, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             
             # Save plain text response
-            txt_filename = f"{base_filename}_{timestamp}.txt"
-            txt_path = self.output_dir / txt_filename
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write(response.get('generated_text', ''))
+            txt_path = self.output_dir / f"{file_stem}.txt"
+            self._enqueue_write(txt_path, response.get('generated_text', '').encode('utf-8'))
             
-            logger.info(f"API response saved to: {output_path} and {txt_path}")
+            logger.info("API response queued for saving to: %s and %s", output_path, txt_path)
             return True
             
         except Exception as e:
             logger.error(f"Failed to save API response: {e}")
             return False
     
-    def process_transcription(self, transcription_text: str, audio_filename: str = None) -> Optional[Dict[str, Any]]:
+    def _response_base_filename(self, audio_filename: Optional[str], base_stem: Optional[str] = None) -> str:
+        """
+        Build the base filename for saved API responses.
+        
+        Args:
+            audio_filename: Original audio filename, if known
+            base_stem: Precomputed stem of audio_filename, if the caller has one
+            
+        Returns:
+            str: Base filename passed to save_api_response()
+        """
+        if base_stem is None and audio_filename:
+            base_stem = Path(audio_filename).stem
+        return f"{base_stem}_api_response" if base_stem else "api_response"
+    
+    def process_transcription(self, transcription_text: str, audio_filename: str = None,
+                              base_stem: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Process transcribed text through Gemini API.
         
         Args:
             transcription_text: Transcribed text to process
             audio_filename: Original audio filename for unique output naming
+            base_stem: Stem of audio_filename, if already computed by the caller
             
         Returns:
             Optional[Dict[str, Any]]: API response data
         """
-        logger.info(f"Processing transcription through Gemini API (length: {len(transcription_text)} characters)")
+        logger.info("Processing transcription through Gemini API (length: %d characters)", len(transcription_text))
         
         # Make API request
         api_response = self.make_api_request(transcription_text)
@@ -279,13 +536,144 @@ class GeminiAPIClient:
             return None
         
         # Save response with unique filename
-        base_filename = f"{Path(audio_filename).stem}_api_response" if audio_filename else "api_response"
+        base_filename = self._response_base_filename(audio_filename, base_stem)
         if not self.save_api_response(parsed_response, base_filename):
             logger.error("Failed to save API response")
             return None
         
         logger.info("API processing completed successfully")
         return parsed_response
+    
+    def format_batch_prompt(self, texts: List[str]) -> str:
+        """
+        Combine several transcriptions into one delimited prompt.
+        
+        Args:
+            texts: Transcribed texts to process in a single request
+            
+        Returns:
+            str: Prompt asking for one delimited answer per transcription
+        """
+        sections = [
+            f"{BATCH_BEGIN_MARKER.format(index=index)}\n{text}\n{BATCH_END_MARKER.format(index=index)}"
+            for index, text in enumerate(texts, start=1)
+        ]
+        header = (
+            f"Process each of the following {len(texts)} transcriptions independently, "
+            "exactly as if each had been sent to you on its own. "
+            "Wrap your answer for transcription N between the lines "
+            f"{BATCH_BEGIN_MARKER.format(index='N')} and {BATCH_END_MARKER.format(index='N')}, "
+            "and write nothing outside those markers."
+        )
+        return header + "\n\n" + "\n".join(sections)
+    
+    def split_batch_response(self, generated_text: str, count: int) -> Optional[List[str]]:
+        """
+        Split a batched answer back into one answer per transcription.
+        
+        Args:
+            generated_text: Text generated for a prompt from format_batch_prompt()
+            count: Number of transcriptions in the batch
+            
+        Returns:
+            Optional[List[str]]: Answers in input order, or None if any is missing
+        """
+        answers = {}
+        for match in BATCH_SECTION_RE.finditer(generated_text):
+            answers.setdefault(int(match.group(1)), match.group(2).strip())
+        
+        if any(index not in answers for index in range(1, count + 1)):
+            return None
+        return [answers[index] for index in range(1, count + 1)]
+    
+    def _process_batch_group(self, group: List[Tuple[str, str]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Process one group of transcriptions with a single API request.
+        
+        Falls back to one request per transcription if the batched answer
+        cannot be split back into per-file answers.
+        
+        Args:
+            group: (transcription_text, audio_filename) pairs sent together
+            
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: API response per audio filename (None if failed)
+        """
+        if len(group) == 1:
+            text, audio_filename = group[0]
+            return {audio_filename: self.process_transcription(text, audio_filename)}
+        
+        logger.info("Processing batch of %d transcriptions through Gemini API", len(group))
+        
+        answers = None
+        api_response = self.make_api_request(self.format_batch_prompt([text for text, _ in group]))
+        parsed_response = self.parse_api_response(api_response) if api_response else None
+        if parsed_response:
+            answers = self.split_batch_response(parsed_response['generated_text'], len(group))
+        
+        if answers is None:
+            logger.warning("Batched API request failed or could not be split; processing transcriptions individually")
+            return {
+                audio_filename: self.process_transcription(text, audio_filename)
+                for text, audio_filename in group
+            }
+        
+        results = {}
+        for (_, audio_filename), answer in zip(group, answers):
+            file_response = dict(parsed_response, generated_text=answer, batch_size=len(group))
+            if self.save_api_response(file_response, self._response_base_filename(audio_filename)):
+                results[audio_filename] = file_response
+            else:
+                logger.error(f"Failed to save API response for {audio_filename}")
+                results[audio_filename] = None
+        return results
+    
+    def process_transcription_batch(self, items: List[Tuple[str, str]], batch_size: int = 8,
+                                    max_concurrency: int = 8) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Process several transcriptions through Gemini API in batched requests.
+        
+        Transcriptions are grouped up to batch_size at a time (and within
+        max_prompt_chars) into a single delimited prompt, cutting the number of
+        HTTP requests (and rate-limit slots) by roughly that factor. Groups are dispatched concurrently from a bounded
+        thread pool sharing this client's HTTP session.
+        
+        Args:
+            items: (transcription_text, audio_filename) pairs to process
+            batch_size: Maximum number of transcriptions per request
+            max_concurrency: Maximum number of requests in flight at once
+            
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: API response per audio filename (None if failed)
+        """
+        results = {}
+        if not items:
+            return results
+        
+        # Group greedily, starting a new group when it is full or its combined
+        # prompt would exceed max_prompt_chars
+        groups = []
+        group = []
+        for item in items:
+            candidate = group + [item]
+            if group and (len(candidate) > batch_size or
+                          len(self.format_batch_prompt([text for text, _ in candidate])) > self.max_prompt_chars):
+                groups.append(group)
+                group = [item]
+            else:
+                group = candidate
+        groups.append(group)
+        
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(groups))) as executor:
+            futures = [(group, executor.submit(self._process_batch_group, group)) for group in groups]
+            for group, future in futures:
+                try:
+                    results.update(future.result())
+                except Exception as e:
+                    logger.error(f"API batch processing failed: {e}")
+                    results.update({audio_filename: None for _, audio_filename in group})
+        
+        return results
 
 
 # Test function removed - use main.py for testing
\ No newline at end of file
@@ -5,20 +5,33 @@ Handles MP3 to WAV conversion with specific requirements:
 - Converts MP3 to WAV format
 - Sets sample rate to 16kHz
 - Converts to mono channel
-- Uses FFmpeg for conversion
+- Decodes in-process with PyAV (libswresample) when available,
+  falling back to the FFmpeg command line
 - Maintains audio quality during conversion
 """
 
 import logging
+import os
+import shutil
+import stat
+import threading
+import wave
 from pathlib import Path
 from typing import Optional
 import ffmpeg
-from pydub import AudioSegment
+import numpy as np
 from constants import SAMPLE_RATE, CHANNELS, MAX_FILE_SIZE_MB, SUPPORTED_AUDIO_EXTENSIONS
 
+try:
+    import av
+except ImportError:  # PyAV is optional; fall back to the ffmpeg binary
+    av = None
+
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+_SUPPORTED_EXTENSIONS = frozenset(SUPPORTED_AUDIO_EXTENSIONS)
+
 
 class AudioProcessor:
     """Handles audio file processing and conversion."""
@@ -36,6 +49,16 @@ class AudioProcessor:
         self.sample_rate = SAMPLE_RATE
         self.channels = CHANNELS
         
+        # float32 samples decoded by recent conversions, keyed by WAV path; files may be
+        # converted ahead of transcription, so a few are kept until collected
+        self._decoded_audio = {}
+        self._decoded_audio_lock = threading.Lock()
+        self._max_decoded_audio = 4
+        
+        # int16 decode buffer reused across files; grows to the longest file seen
+        self._pcm_pool = np.empty(0, dtype=np.int16)
+        self._pcm_pool_lock = threading.Lock()
+        
         # Output directory will be created by pipeline orchestrator
         
         logger.info(f"Audio processor initialized with input_dir={input_dir}, output_dir={output_dir}")
@@ -50,16 +73,26 @@ class AudioProcessor:
         Returns:
             bool: True if file is valid, False otherwise
         """
-        if not file_path.exists():
+        # A single stat call covers existence, file type and size
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
             logger.error(f"Audio file not found: {file_path}")
             return False
+        except OSError as e:
+            logger.error(f"Cannot access audio file {file_path}: {e}")
+            return False
         
         if not file_path.suffix.lower() in SUPPORTED_AUDIO_EXTENSIONS:
             logger.error(f"Unsupported audio format: {file_path.suffix}. Only {SUPPORTED_AUDIO_EXTENSIONS} are supported.")
             return False
         
+        if not stat.S_ISREG(file_stat.st_mode):
+            logger.error(f"Audio path is not a regular file: {file_path}")
+            return False
+        
         # Check file size (max 50MB as per FR-001)
-        file_size_mb = file_path.stat().st_size / (1024 * 1024)
+        file_size_mb = file_stat.st_size / (1024 * 1024)
         if file_size_mb > MAX_FILE_SIZE_MB:
             logger.error(f"File size {file_size_mb:.2f}MB exceeds maximum limit of {MAX_FILE_SIZE_MB}MB")
             return False
@@ -89,19 +122,22 @@ class AudioProcessor:
         try:
             logger.info(f"Starting conversion: {input_path} -> {output_path}")
             
-            # Use FFmpeg for conversion with specific parameters
-            stream = ffmpeg.input(str(input_path))
-            stream = ffmpeg.output(
-                stream,
-                str(output_path),
-                acodec='pcm_s16le',  # 16-bit PCM
-                ar=self.sample_rate,  # 16kHz sample rate
-                ac=self.channels,     # mono channel
-                loglevel='warning'
-            )
-            
-            # Run the conversion
-            ffmpeg.run(stream, overwrite_output=True)
+            if self._is_target_wav(input_path):
+                # Already 16-bit PCM at the target rate and channel count
+                shutil.copyfile(input_path, output_path)
+            elif av is not None:
+                with self._pcm_pool_lock:
+                    length = self._decode_with_av(input_path)
+                    pcm = self._pcm_pool[:length]
+                    self._write_wav(output_path, pcm)
+                    # Keep a float copy for transcription; the pool is reused by the next file
+                    samples = self._pcm_to_float(pcm)
+                with self._decoded_audio_lock:
+                    self._decoded_audio[str(output_path)] = samples
+                    while len(self._decoded_audio) > self._max_decoded_audio:
+                        self._decoded_audio.pop(next(iter(self._decoded_audio)))
+            else:
+                self._convert_with_ffmpeg(input_path, output_path)
             
             logger.info(f"Conversion completed successfully: {output_path}")
             return str(output_path)
@@ -113,25 +149,189 @@ class AudioProcessor:
             logger.error(f"Audio conversion failed: {e}")
             return None
     
+    def _is_target_wav(self, input_path: Path) -> bool:
+        """
+        Check whether a file is already a WAV in the target format.
+        
+        Only the RIFF header is read; non-WAV inputs fail to open and
+        are reported as not matching.
+        
+        Args:
+            input_path: Path to the audio file
+            
+        Returns:
+            bool: True if the file is 16-bit PCM WAV at the target sample rate and channel count
+        """
+        if input_path.suffix.lower() != '.wav':
+            return False
+        try:
+            with wave.open(str(input_path), 'rb') as wav_file:
+                return (wav_file.getsampwidth() == 2
+                        and wav_file.getnchannels() == self.channels
+                        and wav_file.getframerate() == self.sample_rate)
+        except (wave.Error, EOFError):
+            return False
+    
+    def _decode_with_av(self, input_path: Path) -> int:
+        """
+        Decode an audio file in-process to 16-bit mono PCM at the target sample rate.
+        
+        Samples are written to the start of the shared PCM pool, which the
+        caller must hold _pcm_pool_lock for.
+        
+        Args:
+            input_path: Path to the audio file
+            
+        Returns:
+            int: Number of samples decoded into the pool
+        """
+        with av.open(str(input_path)) as container:
+            resampler = av.AudioResampler(format='s16', layout='mono', rate=self.sample_rate)
+            
+            # Size the pool from the container duration so it rarely needs to grow mid-decode
+            if container.duration:
+                self._grow_pcm_pool(self.sample_rate + int(container.duration * self.sample_rate / av.time_base), 0)
+            length = 0
+            
+            def append(frames):
+                nonlocal length
+                for frame in frames:
+                    chunk = frame.to_ndarray().reshape(-1)
+                    end = length + chunk.size
+                    if end > self._pcm_pool.size:
+                        self._grow_pcm_pool(max(end, self._pcm_pool.size * 2), length)
+                    self._pcm_pool[length:end] = chunk
+                    length = end
+            
+            for frame in container.decode(audio=0):
+                append(resampler.resample(frame))
+            # Drain samples still buffered inside the resampler
+            append(resampler.resample(None))
+        
+        return length
+    
+    def _grow_pcm_pool(self, size: int, keep: int) -> None:
+        """
+        Enlarge the PCM pool to at least `size` samples.
+        
+        Args:
+            size: Required number of samples
+            keep: Number of leading samples to carry over
+        """
+        if size <= self._pcm_pool.size:
+            return
+        pool = np.empty(size, dtype=np.int16)
+        pool[:keep] = self._pcm_pool[:keep]
+        self._pcm_pool = pool
+    
+    @staticmethod
+    def _pcm_to_float(samples: np.ndarray) -> np.ndarray:
+        """
+        Convert int16 PCM samples to float32 in [-1, 1).
+        
+        Args:
+            samples: int16 samples
+            
+        Returns:
+            np.ndarray: float32 samples
+        """
+        converted = samples.astype(np.float32)
+        converted *= 1.0 / 32768.0
+        return converted
+    
+    def _write_wav(self, output_path: Path, samples: np.ndarray) -> None:
+        """
+        Write 16-bit PCM samples to a WAV file.
+        
+        Args:
+            output_path: Destination WAV path
+            samples: int16 samples
+        """
+        with wave.open(str(output_path), 'wb') as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(2)  # 16-bit PCM
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(samples.tobytes())
+    
+    def _convert_with_ffmpeg(self, input_path: Path, output_path: Path) -> None:
+        """
+        Convert an audio file with the FFmpeg command line.
+        
+        Args:
+            input_path: Path to the audio file
+            output_path: Destination WAV path
+        """
+        # Map only the first audio stream so cover art and other streams are skipped
+        stream = ffmpeg.input(str(input_path), threads=0)['a:0']
+        stream = ffmpeg.output(
+            stream,
+            str(output_path),
+            acodec='pcm_s16le',  # 16-bit PCM
+            ar=self.sample_rate,  # 16kHz sample rate
+            ac=self.channels,     # mono channel
+            vn=None,              # no video output
+            threads=0,            # let FFmpeg pick the thread count
+            filter_threads=0,     # same for the resampling filter
+            loglevel='warning'
+        )
+        
+        # Run the conversion
+        ffmpeg.run(stream, overwrite_output=True)
+    
+    def get_audio_samples(self, wav_path: str) -> Optional[np.ndarray]:
+        """
+        Get the samples of a converted WAV file for transcription.
+        
+        Samples decoded in-process by the last conversion are handed over
+        without touching the disk; otherwise the WAV file is read back.
+        
+        Args:
+            wav_path: Path to a WAV file produced by convert_mp3_to_wav
+            
+        Returns:
+            Optional[np.ndarray]: float32 mono samples in [-1, 1), or None if reading failed
+        """
+        with self._decoded_audio_lock:
+            samples = self._decoded_audio.pop(str(wav_path), None)
+        
+        if samples is not None:
+            return samples
+        
+        try:
+            with wave.open(str(wav_path), 'rb') as wav_file:
+                if wav_file.getsampwidth() != 2 or wav_file.getnchannels() != self.channels:
+                    logger.warning(f"Unexpected WAV format: {wav_path}")
+                    return None
+                pcm = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+        except Exception as e:
+            logger.warning(f"Failed to read audio samples: {e}")
+            return None
+        
+        return self._pcm_to_float(pcm)
+    
     def get_audio_info(self, file_path: str) -> Optional[dict]:
         """
         Get audio file information.
         
+        Reads only the WAV header, so this works for the converted files
+        without decoding them again.
+        
         Args:
-            file_path: Path to the audio file
+            file_path: Path to the WAV file
             
         Returns:
             Optional[dict]: Audio file information
         """
         try:
-            audio = AudioSegment.from_file(file_path)
-            return {
-                'duration_seconds': len(audio) / 1000,
-                'sample_rate': audio.frame_rate,
-                'channels': audio.channels,
-                'frame_width': audio.sample_width,
-                'file_size_mb': Path(file_path).stat().st_size / (1024 * 1024)
-            }
+            with wave.open(str(file_path), 'rb') as wav_file:
+                frame_rate = wav_file.getframerate()
+                return {
+                    'duration_seconds': wav_file.getnframes() / frame_rate,
+                    'sample_rate': frame_rate,
+                    'channels': wav_file.getnchannels(),
+                    'frame_width': wav_file.getsampwidth() * wav_file.getnchannels(),
+                    'file_size_mb': Path(file_path).stat().st_size / (1024 * 1024)
+                }
         except Exception as e:
             logger.error(f"Failed to get audio info: {e}")
             return None
@@ -172,7 +372,12 @@ class AudioProcessor:
             logger.warning(f"Input directory does not exist: {self.input_dir}")
             return []
         
-        audio_files = [f.name for f in self.input_dir.glob("*.mp3")]
+        # DirEntry caches the file type, so is_file() needs no extra stat
+        with os.scandir(self.input_dir) as entries:
+            audio_files = [
+                entry.name for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in _SUPPORTED_EXTENSIONS and entry.is_file()
+            ]
         logger.info(f"Found {len(audio_files)} MP3 files in {self.input_dir}")
         return audio_files
 
@@ -2,8 +2,20 @@
 SAMPLE_RATE = 16000
 CHANNELS = 1
 MAX_FILE_SIZE_MB = 50
+MAX_AUDIO_SECONDS = 30 * 60  # audio beyond this is not transcribed
 SUPPORTED_AUDIO_EXTENSIONS = ['.mp3']
 
+# Voice activity detection (silence skipped before transcription)
+VAD_FRAME_MS = 30
+VAD_MIN_SILENCE_MS = 500
+VAD_SPEECH_PAD_MS = 200
+VAD_ENERGY_FLOOR = 0.005  # RMS below this is always treated as silence
+VAD_MIN_SPEECH_FRACTION = 0.05  # below this much detected speech, the untrimmed audio is transcribed
+
+# Long audio is transcribed as overlapping chunks in parallel (faster-whisper only)
+TRANSCRIPTION_CHUNK_SECONDS = 30
+TRANSCRIPTION_CHUNK_OVERLAP_SECONDS = 1
+
 # Transcription output patterns
 TRANSCRIPTION_TXT_PATTERN = "{audio_name}_transcription.txt"
 TRANSCRIPTION_JSON_PATTERN = "{audio_name}_transcription_detailed.json"
@@ -18,4 +30,19 @@ TTS_METADATA_PATTERN = "{base_filename}_metadata.json"
 
 # (Optional) Add more patterns for API responses, summaries, etc.
 # API_RESPONSE_JSON_PATTERN = "{audio_name}_api_response_{timestamp}.json"
-# PIPELINE_SUMMARY_PATTERN = "{audio_name}_pipeline_summary.json"
\ No newline at end of file
+# PIPELINE_SUMMARY_PATTERN = "{audio_name}_pipeline_summary.json"
+
+# Files produced for each processed audio file (shown in the CLI help)
+OUTPUT_FILE_PATTERNS = [
+    "{audio_name}_converted.wav (converted audio)",
+    "{audio_name}_converted_transcription.txt (plain text transcription)",
+    "{audio_name}_converted_transcription_detailed.json (detailed transcription data)",
+    "{audio_name}_api_response_YYYYMMDD_HHMMSS_ffffff.json (Gemini API response)",
+    "{audio_name}_api_response_YYYYMMDD_HHMMSS_ffffff.txt (API response text)",
+    "{audio_name}_translation.txt (Tamil translation)",
+    "{audio_name}_translation_detailed.json (detailed translation data)",
+    "{audio_name}_YYYYMMDD_HHMMSS.mp3 (Tamil audio output)",
+    "{audio_name}_metadata.json (TTS metadata)",
+    "{audio_name}_pipeline_summary.json (execution summary)",
+    "pipeline.log (detailed execution log)"
+]
@@ -1,8 +1,11 @@
 """
 Pipeline Orchestrator Module
 
-Coordinates all pipeline components with sequential processing:
-- Coordinates all pipeline steps sequentially
+Coordinates all pipeline components:
+- Runs each file's pipeline steps in order
+- Transcribes batches of files in parallel worker processes
+- Converts upcoming files while the current one is transcribed
+- Overlaps Gemini API requests with ongoing transcription
 - Provides progress feedback
 - Implements proper error handling
 - Logs all operations for debugging
@@ -10,10 +13,12 @@ Coordinates all pipeline components with sequential processing:
 
 import os
 import logging
-import time
-import json
+import orjson
+import multiprocessing
+import logging.handlers
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from datetime import datetime
 
 from audio_processor import AudioProcessor
@@ -25,30 +30,51 @@ from tts import TTSEngine
 # Remove logging.basicConfig here; logging is configured in main.py
 logger = logging.getLogger(__name__)
 
+# Pipeline instance owned by each transcription worker process
+_worker_pipeline = None
+
 
 class AudioTranscriptionPipeline:
     """Main pipeline orchestrator for audio transcription and API processing."""
     
-    def __init__(self, input_dir: str = "audio", output_dir: str = "output"):
+    def __init__(self, input_dir: str = "audio", output_dir: str = "output",
+                 use_cache: bool = True, refresh_cache: bool = False,
+                 transcription_only: bool = False, chunk_workers: Optional[int] = None):
         """
         Initialize the pipeline.
         
         Args:
             input_dir: Directory containing input audio files
             output_dir: Directory for all outputs
+            use_cache: Whether to reuse cached results from previous runs
+            refresh_cache: Ignore cached results but store fresh ones
+            transcription_only: Create only the components for steps 1-2 (used by
+                transcription worker processes)
+            chunk_workers: Threads transcribing chunks of one long file (default: one per CPU core)
         """
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         
         # Initialize components
         self.audio_processor = AudioProcessor(input_dir, output_dir)
-        self.transcription_engine = TranscriptionEngine(output_dir=output_dir)
-        self.api_client = GeminiAPIClient(output_dir=output_dir)
-        self.translation_engine = TranslationEngine(output_dir=output_dir)
-        self.tts_engine = TTSEngine(output_dir=output_dir)
+        self.transcription_engine = TranscriptionEngine(output_dir=output_dir, chunk_workers=chunk_workers or os.cpu_count() or 1,
+                                                        use_cache=use_cache, refresh_cache=refresh_cache)
+        if transcription_only:
+            self.api_client = None
+            self.translation_engine = None
+            self.tts_engine = None
+        else:
+            self.api_client = GeminiAPIClient(output_dir=output_dir, use_cache=use_cache, refresh_cache=refresh_cache)
+            self.translation_engine = TranslationEngine(output_dir=output_dir, use_cache=use_cache, refresh_cache=refresh_cache)
+            self.tts_engine = TTSEngine(output_dir=output_dir, use_cache=use_cache, refresh_cache=refresh_cache)
+        
+        # Batch processing settings
+        self.api_batch_size = 8  # transcriptions per Gemini request
+        self.api_concurrency = 4  # batched Gemini requests in flight
         
         # Pipeline state
         self.current_file = None
+        self.current_stem = None
         self.pipeline_start_time = None
         self.step_results = {}
         
@@ -57,6 +83,14 @@ class AudioTranscriptionPipeline:
         
         logger.info("Audio Transcription Pipeline initialized")
     
+    def close(self) -> None:
+        """Release resources held by pipeline components (e.g. HTTP connections)."""
+        if self.api_client is not None:
+            for path in self.api_client.close():
+                logger.error(f"API response file was not written: {path}")
+        if self.translation_engine is not None:
+            self.translation_engine.close()
+    
     def validate_environment(self) -> bool:
         """
         Validate the pipeline environment and dependencies.
@@ -85,12 +119,13 @@ class AudioTranscriptionPipeline:
         logger.info(f"Environment validation passed. Found {len(audio_files)} audio files")
         return True
     
-    def process_audio_step(self, audio_file: str) -> Optional[str]:
+    def process_audio_step(self, audio_file: str, wav_future: Optional[Future] = None) -> Optional[str]:
         """
         Process audio file through the audio processing step.
         
         Args:
             audio_file: Name of the audio file to process
+            wav_future: Conversion of audio_file already started in the background
             
         Returns:
             Optional[str]: Path to processed WAV file
@@ -98,7 +133,10 @@ class AudioTranscriptionPipeline:
         logger.info(f"Step 1: Audio Processing - {audio_file}")
         
         try:
-            wav_path = self.audio_processor.process_audio_file(audio_file)
+            if wav_future is not None:
+                wav_path = wav_future.result()
+            else:
+                wav_path = self.audio_processor.process_audio_file(audio_file)
             if wav_path:
                 logger.info(f"Audio processing completed: {wav_path}")
                 self.step_results['audio_processing'] = {
@@ -137,7 +175,9 @@ class AudioTranscriptionPipeline:
         logger.info(f"Step 2: Transcription - {wav_path}")
         
         try:
-            transcription_result = self.transcription_engine.process_audio_file(wav_path)
+            # Hand the decoded samples straight to Whisper instead of having it re-decode the WAV
+            audio = self.audio_processor.get_audio_samples(wav_path)
+            transcription_result = self.transcription_engine.process_audio_file(wav_path, audio)
             if transcription_result:
                 logger.info("Transcription completed successfully")
                 self.step_results['transcription'] = {
@@ -177,22 +217,7 @@ class AudioTranscriptionPipeline:
         
         try:
             # Pass the current audio filename for unique output naming
-            api_response = self.api_client.process_transcription(transcription_text, self.current_file)
-            if api_response:
-                logger.info("API processing completed successfully")
-                self.step_results['api_processing'] = {
-                    'status': 'success',
-                    'response_length': len(api_response.get('generated_text', ''))
-                }
-                return api_response
-            else:
-                logger.error("API processing failed")
-                self.step_results['api_processing'] = {
-                    'status': 'failed',
-                    'input_length': len(transcription_text)
-                }
-                return None
-                
+            api_response = self.api_client.process_transcription(transcription_text, self.current_file, self.current_stem)
         except Exception as e:
             logger.error(f"API processing error: {e}")
             self.step_results['api_processing'] = {
@@ -201,6 +226,61 @@ class AudioTranscriptionPipeline:
                 'input_length': len(transcription_text)
             }
             return None
+        
+        return self._record_api_result(transcription_text, api_response)
+    
+    def _record_api_result(self, transcription_text: str, api_response: Optional[Dict[str, Any]],
+                           failed_writes: Optional[List[Path]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Record the outcome of the API step for the current file.
+        
+        Args:
+            transcription_text: Transcribed text that was sent to the API
+            api_response: Parsed API response, or None if the request failed
+            failed_writes: Response files the API client could not write, as returned by its flush()
+            
+        Returns:
+            Optional[Dict[str, Any]]: API response
+        """
+        if api_response and self._api_writes_failed(failed_writes):
+            return None
+        
+        if api_response:
+            logger.info("API processing completed successfully")
+            self.step_results['api_processing'] = {
+                'status': 'success',
+                'response_length': len(api_response.get('generated_text', ''))
+            }
+            return api_response
+        
+        logger.error("API processing failed")
+        self.step_results['api_processing'] = {
+            'status': 'failed',
+            'input_length': len(transcription_text)
+        }
+        return None
+    
+    def _api_writes_failed(self, failed_writes: Optional[List[Path]]) -> bool:
+        """
+        Mark the API step failed if the current file's response files could not be written.
+        
+        Args:
+            failed_writes: Response files the API client could not write, as returned by its flush()
+            
+        Returns:
+            bool: True if any response file of the current file failed to write
+        """
+        # Saved responses are named {audio_name}_api_response_<timestamp>.json/.txt
+        write_prefix = f"{self.current_stem}_api_response_"
+        if not any(path.name.startswith(write_prefix) for path in failed_writes or ()):
+            return False
+        
+        logger.error("Failed to write API response files")
+        self.step_results.setdefault('api_processing', {}).update(
+            status='error',
+            error='Failed to write API response files'
+        )
+        return True
     
     def translation_step(self, english_text: str) -> Optional[Dict[str, Any]]:
         """
@@ -216,7 +296,7 @@ class AudioTranscriptionPipeline:
         
         try:
             # Use the current file name for unique output naming
-            base_filename = Path(self.current_file).stem if self.current_file else "translation"
+            base_filename = self.current_stem or "translation"
             translation_result = self.translation_engine.process_text(english_text, base_filename)
             if translation_result:
                 logger.info("Translation completed successfully")
@@ -257,7 +337,7 @@ class AudioTranscriptionPipeline:
         
         try:
             # Use the current file name for unique output naming
-            base_filename = Path(self.current_file).stem if self.current_file else "tamil_speech"
+            base_filename = self.current_stem or "tamil_speech"
             tts_result = self.tts_engine.process_text(tamil_text, base_filename)
             if tts_result:
                 logger.info("TTS completed successfully")
@@ -292,11 +372,13 @@ class AudioTranscriptionPipeline:
             bool: True if saved successfully, False otherwise
         """
         try:
+            # Read the clock once; the duration is plain datetime arithmetic
+            end_time = datetime.now()
             summary = {
                 'pipeline_info': {
                     'start_time': self.pipeline_start_time.isoformat() if self.pipeline_start_time else None,
-                    'end_time': datetime.now().isoformat(),
-                    'duration_seconds': time.time() - self.pipeline_start_time.timestamp() if self.pipeline_start_time else None,
+                    'end_time': end_time.isoformat(),
+                    'duration_seconds': (end_time - self.pipeline_start_time).total_seconds() if self.pipeline_start_time else None,
                     'input_file': self.current_file
                 },
                 'step_results': self.step_results,
@@ -307,16 +389,14 @@ class AudioTranscriptionPipeline:
             }
             
             # Generate unique summary filename based on input file
-            if self.current_file:
-                base_name = Path(self.current_file).stem
-                summary_filename = f"{base_name}_pipeline_summary.json"
+            if self.current_stem:
+                summary_filename = f"{self.current_stem}_pipeline_summary.json"
             else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = end_time.strftime("%Y%m%d_%H%M%S")
                 summary_filename = f"pipeline_summary_{timestamp}.json"
             
             summary_path = self.output_dir / summary_filename
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2, ensure_ascii=False)
+            summary_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             
             logger.info(f"Pipeline summary saved to: {summary_path}")
             return True
@@ -325,6 +405,103 @@ class AudioTranscriptionPipeline:
             logger.error(f"Failed to save pipeline summary: {e}")
             return False
     
+    def _start_file(self, audio_file: str) -> None:
+        """
+        Reset per-file pipeline state before processing a new file.
+        
+        Args:
+            audio_file: Name of the audio file about to be processed
+        """
+        self.current_file = audio_file
+        self.current_stem = Path(audio_file).stem
+        self.pipeline_start_time = datetime.now()
+        self.step_results = {}
+    
+    def _handle_pipeline_error(self, error: Exception) -> bool:
+        """
+        Record an unexpected pipeline error for the current file.
+        
+        Args:
+            error: Exception raised while processing the current file
+            
+        Returns:
+            bool: Always False, for use as the file's result
+        """
+        logger.error(f"Pipeline error: {error}")
+        self.step_results['pipeline_error'] = {
+            'status': 'error',
+            'error': str(error)
+        }
+        self.save_pipeline_summary()
+        return False
+    
+    def run_transcription_stages(self, audio_file: str, wav_future: Optional[Future] = None) -> Optional[str]:
+        """
+        Run audio processing and transcription (steps 1-2) for the current file.
+        
+        Args:
+            audio_file: Name of the audio file to process
+            wav_future: Conversion of audio_file already started in the background
+            
+        Returns:
+            Optional[str]: Transcribed text, or None if a step failed
+        """
+        # Step 1: Audio Processing
+        wav_path = self.process_audio_step(audio_file, wav_future)
+        if not wav_path:
+            logger.error("Pipeline failed at audio processing step")
+            return None
+        
+        # Step 2: Transcription
+        transcription_result = self.transcribe_audio_step(wav_path)
+        if not transcription_result:
+            logger.error("Pipeline failed at transcription step")
+            return None
+        
+        transcription_text = transcription_result.get('text', '')
+        if not transcription_text.strip():
+            logger.error("Transcription produced empty text")
+            return None
+        
+        return transcription_text
+    
+    def run_output_stages(self, transcription_text: str, api_response: Dict[str, Any]) -> bool:
+        """
+        Run translation and TTS (steps 4-5) for the current file and save its summary.
+        
+        Args:
+            transcription_text: Transcribed text, used if the API returned no text
+            api_response: Parsed API response for the current file
+            
+        Returns:
+            bool: True if the remaining steps completed successfully, False otherwise
+        """
+        # Step 4: Translation (English to Tamil)
+        english_text = api_response.get('generated_text', transcription_text)
+        translation_result = self.translation_step(english_text)
+        if not translation_result:
+            logger.error("Pipeline failed at translation step")
+            return False
+        
+        # Step 5: Text-to-Speech (Tamil text to audio)
+        tamil_text = translation_result.get('translated_text', '')
+        tts_result = self.tts_step(tamil_text)
+        if not tts_result:
+            logger.error("Pipeline failed at TTS step")
+            return False
+        
+        # API response files were written in the background while steps 4-5 ran;
+        # wait for them once before the summary records the file as done
+        if self._api_writes_failed(self.api_client.flush()):
+            logger.error("Pipeline failed at API processing step")
+            return False
+        
+        # Save pipeline summary
+        self.save_pipeline_summary()
+        
+        logger.info(f"Pipeline completed successfully for {self.current_file}")
+        return True
+    
     def process_single_file(self, audio_file: str) -> bool:
         """
         Process a single audio file through the complete pipeline.
@@ -335,28 +512,14 @@ class AudioTranscriptionPipeline:
         Returns:
             bool: True if pipeline completed successfully, False otherwise
         """
-        self.current_file = audio_file
-        self.pipeline_start_time = datetime.now()
-        self.step_results = {}
+        self._start_file(audio_file)
         
         logger.info(f"Starting pipeline for file: {audio_file}")
         
         try:
-            # Step 1: Audio Processing
-            wav_path = self.process_audio_step(audio_file)
-            if not wav_path:
-                logger.error("Pipeline failed at audio processing step")
-                return False
-            
-            # Step 2: Transcription
-            transcription_result = self.transcribe_audio_step(wav_path)
-            if not transcription_result:
-                logger.error("Pipeline failed at transcription step")
-                return False
-            
-            transcription_text = transcription_result.get('text', '')
-            if not transcription_text.strip():
-                logger.error("Transcription produced empty text")
+            # Steps 1-2: Audio Processing and Transcription
+            transcription_text = self.run_transcription_stages(audio_file)
+            if not transcription_text:
                 return False
             
             # Step 3: API Processing
@@ -365,39 +528,123 @@ class AudioTranscriptionPipeline:
                 logger.error("Pipeline failed at API processing step")
                 return False
             
-            # Step 4: Translation (English to Tamil)
-            english_text = api_response.get('generated_text', transcription_text)
-            translation_result = self.translation_step(english_text)
-            if not translation_result:
-                logger.error("Pipeline failed at translation step")
-                return False
+            # Steps 4-5: Translation and Text-to-Speech
+            return self.run_output_stages(transcription_text, api_response)
             
-            # Step 5: Text-to-Speech (Tamil text to audio)
-            tamil_text = translation_result.get('translated_text', '')
-            tts_result = self.tts_step(tamil_text)
-            if not tts_result:
-                logger.error("Pipeline failed at TTS step")
-                return False
+        except Exception as e:
+            return self._handle_pipeline_error(e)
+    
+    def _transcribe_file(self, audio_file: str, wav_future: Optional[Future] = None) -> Tuple[str, Optional[str], datetime, Dict[str, Any]]:
+        """
+        Run steps 1-2 for one file and capture its pipeline state.
+        
+        Args:
+            audio_file: Name of the audio file to process
+            wav_future: Conversion of audio_file already started in the background
             
-            # Save pipeline summary
-            self.save_pipeline_summary()
+        Returns:
+            Tuple: (audio_file, transcription text or None, start time, step results)
+        """
+        logger.info(f"Processing file: {audio_file}")
+        self._start_file(audio_file)
+        try:
+            transcription_text = self.run_transcription_stages(audio_file, wav_future)
+        except Exception as e:
+            transcription_text = None
+            self._handle_pipeline_error(e)
+        return audio_file, transcription_text, self.pipeline_start_time, self.step_results
+    
+    def _iter_transcriptions_serial(self, audio_files: List[str], lookahead: int = 2) -> Iterator[Tuple[str, Optional[str], datetime, Dict[str, Any]]]:
+        """
+        Transcribe files in this process while converting the next ones in the background.
+        
+        A single converter thread keeps up to `lookahead` files converted
+        ahead, so FFmpeg/PyAV decoding overlaps with Whisper.
+        
+        Args:
+            audio_files: Names of the audio files to transcribe
+            lookahead: Files converted ahead of the one being transcribed
             
-            logger.info(f"Pipeline completed successfully for {audio_file}")
-            return True
+        Yields:
+            Tuple: (audio_file, transcription text or None, start time, step results)
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-convert") as converter:
+            conversions = {}
+            for index, audio_file in enumerate(audio_files):
+                for upcoming in audio_files[index:index + lookahead + 1]:
+                    if upcoming not in conversions:
+                        conversions[upcoming] = converter.submit(self.audio_processor.process_audio_file, upcoming)
+                yield self._transcribe_file(audio_file, conversions.pop(audio_file))
+    
+    def _iter_transcriptions(self, audio_files: List[str], max_workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[str], datetime, Dict[str, Any]]]:
+        """
+        Transcribe files, yielding each result as soon as it is available.
+        
+        With more than one worker, Whisper and FFmpeg work runs in a pool of
+        worker processes so several files are transcribed at once.
+        
+        Args:
+            audio_files: Names of the audio files to transcribe
+            max_workers: Worker processes to use (default: half the CPU cores,
+                or 1 when Whisper runs on a GPU)
             
-        except Exception as e:
-            logger.error(f"Pipeline error: {e}")
-            self.step_results['pipeline_error'] = {
-                'status': 'error',
-                'error': str(e)
-            }
-            self.save_pipeline_summary()
-            return False
+        Yields:
+            Tuple: (audio_file, transcription text or None, start time, step results)
+        """
+        cpu_count = os.cpu_count() or 1
+        if max_workers is None:
+            # Every worker loads its own Whisper model; on CUDA they would all share one GPU
+            max_workers = 1 if self.transcription_engine.device == "cuda" else max(1, cpu_count // 2)
+        workers = min(max_workers, len(audio_files))
+        if workers <= 1:
+            yield from self._iter_transcriptions_serial(audio_files)
+            return
+        
+        logger.info(f"Transcribing {len(audio_files)} files with {workers} worker processes")
+        
+        # Spawn (rather than fork) so each worker gets a clean torch/CUDA context
+        mp_context = multiprocessing.get_context("spawn")
+        
+        # Worker log records are forwarded through a queue to this process's handlers
+        log_queue = mp_context.Queue()
+        root_logger = logging.getLogger()
+        log_listener = logging.handlers.QueueListener(log_queue, *root_logger.handlers, respect_handler_level=True)
+        log_listener.start()
+        
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp_context,
+                initializer=_init_transcription_worker,
+                initargs=(str(self.input_dir), str(self.output_dir),
+                          self.transcription_engine.use_cache, self.transcription_engine.refresh_cache,
+                          log_queue, root_logger.level, max(1, cpu_count // workers))
+            ) as executor:
+                futures = {executor.submit(_transcribe_in_worker, audio_file): audio_file for audio_file in audio_files}
+                for future in as_completed(futures):
+                    audio_file = futures[future]
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        logger.error(f"Transcription worker failed for {audio_file}: {e}")
+                        yield audio_file, None, datetime.now(), {
+                            'pipeline_error': {'status': 'error', 'error': str(e)}
+                        }
+        finally:
+            log_listener.stop()
     
-    def process_all_files(self) -> Dict[str, bool]:
+    def process_all_files(self, max_workers: Optional[int] = None) -> Dict[str, bool]:
         """
         Process all audio files in the input directory.
         
+        Files are transcribed in parallel worker processes; as transcriptions
+        complete they are sent to Gemini in batched requests on a thread pool,
+        and finally translation and TTS run per file.
+        
+        Args:
+            max_workers: Transcription worker processes (default: half the CPU
+                cores, or 1 on a GPU; 1 transcribes in this process)
+            
         Returns:
             Dict[str, bool]: Results for each file (filename -> success)
         """
@@ -411,13 +658,58 @@ class AudioTranscriptionPipeline:
         # Get all audio files
         audio_files = self.audio_processor.list_audio_files()
         results = {}
+        file_states = {}
+        transcriptions = {}
+        api_responses = {}
         
-        for audio_file in audio_files:
-            logger.info(f"Processing file: {audio_file}")
-            success = self.process_single_file(audio_file)
-            results[audio_file] = success
+        # Steps 1-2 for every file, overlapped with step 3 for finished batches
+        with ThreadPoolExecutor(max_workers=self.api_concurrency) as api_executor:
+            api_futures = []
+            pending = []
+            for audio_file, transcription_text, start_time, step_results in self._iter_transcriptions(audio_files, max_workers):
+                file_states[audio_file] = (start_time, step_results)
+                if not transcription_text:
+                    results[audio_file] = False
+                    continue
+                
+                transcriptions[audio_file] = transcription_text
+                pending.append((transcription_text, audio_file))
+                if len(pending) >= self.api_batch_size:
+                    logger.info(f"Step 3: API Processing - batch of {len(pending)} files")
+                    api_futures.append(api_executor.submit(
+                        self.api_client.process_transcription_batch, pending, self.api_batch_size
+                    ))
+                    pending = []
+            
+            if pending:
+                logger.info(f"Step 3: API Processing - batch of {len(pending)} files")
+                api_futures.append(api_executor.submit(
+                    self.api_client.process_transcription_batch, pending, self.api_batch_size
+                ))
             
-            if success:
+            for future in api_futures:
+                api_responses.update(future.result())
+        
+        # Response files are saved in the background; collect write errors before recording results
+        failed_writes = self.api_client.flush()
+        
+        # Steps 4-5 for every file that made it through the API step
+        for audio_file, transcription_text in transcriptions.items():
+            self.current_file = audio_file
+            self.current_stem = Path(audio_file).stem
+            self.pipeline_start_time, self.step_results = file_states[audio_file]
+            try:
+                api_response = self._record_api_result(transcription_text, api_responses.get(audio_file), failed_writes)
+                if api_response:
+                    results[audio_file] = self.run_output_stages(transcription_text, api_response)
+                else:
+                    logger.error("Pipeline failed at API processing step")
+                    results[audio_file] = False
+            except Exception as e:
+                results[audio_file] = self._handle_pipeline_error(e)
+        
+        for audio_file in audio_files:
+            if results.get(audio_file):
                 logger.info(f"Successfully processed: {audio_file}")
             else:
                 logger.error(f"Failed to process: {audio_file}")
@@ -430,4 +722,53 @@ class AudioTranscriptionPipeline:
         return results
 
 
+def _init_transcription_worker(input_dir: str, output_dir: str, use_cache: bool, refresh_cache: bool,
+                               log_queue: Any, log_level: int, num_threads: int) -> None:
+    """
+    Set up a transcription worker process.
+    
+    Routes the worker's log records to the parent process, limits torch and
+    chunked transcription to its share of the CPU cores and creates the pipeline used for every file the
+    worker handles, loading the Whisper model up front so it stays resident.
+    Only the audio processing and transcription components are created.
+    
+    Args:
+        input_dir: Directory containing input audio files
+        output_dir: Directory for all outputs
+        use_cache: Whether to reuse cached results from previous runs
+        refresh_cache: Ignore cached results but store fresh ones
+        log_queue: Queue read by the parent's QueueListener
+        log_level: Root logger level of the parent process
+        num_threads: torch intra-op threads and transcription chunk threads for this worker
+    """
+    global _worker_pipeline
+    
+    root_logger = logging.getLogger()
+    root_logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root_logger.setLevel(log_level)
+    
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+    
+    _worker_pipeline = AudioTranscriptionPipeline(input_dir, output_dir, use_cache=use_cache, refresh_cache=refresh_cache,
+                                                  transcription_only=True, chunk_workers=num_threads)
+    _worker_pipeline.transcription_engine.load_model()
+
+
+def _transcribe_in_worker(audio_file: str) -> Tuple[str, Optional[str], datetime, Dict[str, Any]]:
+    """
+    Run steps 1-2 for one file inside a transcription worker process.
+    
+    Args:
+        audio_file: Name of the audio file to process
+        
+    Returns:
+        Tuple: (audio_file, transcription text or None, start time, step results)
+    """
+    return _worker_pipeline._transcribe_file(audio_file)
+
+
 # Test function removed - use main.py for testing
\ No newline at end of file
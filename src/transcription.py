@@ -4,40 +4,217 @@ Transcription Module
 Handles Tamil audio transcription to English using OpenAI Whisper:
 - Uses OpenAI Whisper base model
 - Transcribes Tamil audio to English text
-- Runs with fp16=False for CPU compatibility
+- Runs on a CUDA GPU with fp16 when one is available, otherwise on CPU
+  with fp16=False (set FORCE_CPU=1 to always use the CPU)
+- Uses faster-whisper (CTranslate2, int8) instead when it is installed
+- Skips silence before decoding (voice activity detection)
+- Transcribes long audio as parallel chunks on faster-whisper
 - Handles various Tamil dialects and accents
 - Provides confidence scores for transcription
+- Caches results by audio content so identical audio is not transcribed twice
 """
 
+import functools
+import hashlib
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import whisper
 from pathlib import Path
-from typing import Optional, Dict, Any
-import json
-from constants import TRANSCRIPTION_TXT_PATTERN, TRANSCRIPTION_JSON_PATTERN
+from typing import Optional, Dict, Any, List, Tuple
+import orjson
+from constants import (
+    TRANSCRIPTION_TXT_PATTERN, TRANSCRIPTION_JSON_PATTERN, SAMPLE_RATE, MAX_AUDIO_SECONDS,
+    VAD_FRAME_MS, VAD_MIN_SILENCE_MS, VAD_SPEECH_PAD_MS, VAD_ENERGY_FLOOR, VAD_MIN_SPEECH_FRACTION,
+    TRANSCRIPTION_CHUNK_SECONDS, TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+)
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:  # faster-whisper is optional; fall back to reference Whisper
+    WhisperModel = None
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=2)
+def _load_whisper(model_name: str, device: str) -> Any:
+    """
+    Load a Whisper model once per process.
+    
+    Engines asking for the same model and device share the loaded weights
+    instead of deserializing them again.
+    
+    Args:
+        model_name: Whisper model to load
+        device: Torch device to load the model on
+        
+    Returns:
+        The loaded Whisper model
+    """
+    return whisper.load_model(
+        model_name,
+        device=device,
+        download_root=None  # Use default cache location
+    )
+
+
+@functools.lru_cache(maxsize=2)
+def _load_faster_whisper(model_name: str, device: str, compute_type: str, num_workers: int = 1) -> Any:
+    """
+    Load a faster-whisper (CTranslate2) model once per process.
+    
+    Args:
+        model_name: Whisper model to load
+        device: Device to load the model on
+        compute_type: CTranslate2 compute type, e.g. "int8"
+        num_workers: Number of threads that may transcribe with the model at once
+        
+    Returns:
+        The loaded faster-whisper model
+    """
+    return WhisperModel(model_name, device=device, compute_type=compute_type, num_workers=num_workers)
+
+
+def _detect_device() -> str:
+    """
+    Pick the device to run Whisper on.
+    
+    Returns:
+        str: "cuda" if a CUDA GPU is available and FORCE_CPU is not set, otherwise "cpu"
+    """
+    if os.getenv("FORCE_CPU", "").lower() in ("1", "true", "yes"):
+        return "cpu"
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return "cuda"
+    except ImportError:
+        pass
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda"
+    except ImportError:
+        pass
+    return "cpu"
+
+
+def _stitch_text(previous: str, following: str, max_words: int = 8) -> str:
+    """
+    Join two transcription texts, dropping words repeated across a chunk overlap.
+    
+    Args:
+        previous: Text transcribed so far
+        following: Text of the next chunk
+        max_words: Longest repeated word run to look for
+        
+    Returns:
+        str: Joined text
+    """
+    previous_words = previous.split()
+    following_words = following.split()
+    
+    def normalize(words):
+        return [re.sub(r"[^\w]", "", word).lower() for word in words]
+    
+    for size in range(min(max_words, len(previous_words), len(following_words)), 0, -1):
+        if normalize(previous_words[-size:]) == normalize(following_words[:size]):
+            following_words = following_words[size:]
+            break
+    
+    return " ".join(previous_words + following_words)
+
+
+def _detect_speech_spans(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> List[Tuple[int, int]]:
+    """
+    Find speech regions in decoded audio using frame energy.
+    
+    Frames louder than a threshold relative to the recording's loud frames
+    count as speech. Gaps shorter than VAD_MIN_SILENCE_MS are bridged and
+    every span is padded by VAD_SPEECH_PAD_MS.
+    
+    Args:
+        audio: float32 mono samples
+        sample_rate: Sample rate of the audio
+        
+    Returns:
+        List[Tuple[int, int]]: (start, end) sample indices of speech spans
+    """
+    frame_len = sample_rate * VAD_FRAME_MS // 1000
+    num_frames = len(audio) // frame_len
+    if num_frames == 0:
+        return [(0, len(audio))] if len(audio) else []
+    
+    frames = audio[:num_frames * frame_len].reshape(num_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    threshold = max(VAD_ENERGY_FLOOR, 0.05 * float(np.percentile(rms, 95)))
+    speech_frames = np.flatnonzero(rms > threshold)
+    if speech_frames.size == 0:
+        return []
+    
+    # Split wherever the silence between speech frames is long enough
+    min_gap = VAD_MIN_SILENCE_MS // VAD_FRAME_MS
+    breaks = np.flatnonzero(np.diff(speech_frames) > min_gap)
+    starts = np.concatenate(([speech_frames[0]], speech_frames[breaks + 1]))
+    ends = np.concatenate((speech_frames[breaks], [speech_frames[-1]])) + 1
+    
+    pad = sample_rate * VAD_SPEECH_PAD_MS // 1000
+    spans = []
+    for start, end in zip(starts * frame_len, ends * frame_len):
+        start = max(0, start - pad)
+        end = min(len(audio), end + pad)
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((int(start), int(end)))
+    return spans
+
+
 class TranscriptionEngine:
     """Handles audio transcription using OpenAI Whisper."""
     
-    def __init__(self, model_name: str = "base", output_dir: str = "output"):
+    # Bump when transcription settings change so older cache entries are ignored
+    CACHE_VERSION = "v1"
+    
+    def __init__(self, model_name: str = "base", output_dir: str = "output",
+                 backend: Optional[str] = None, chunk_workers: int = 1,
+                 use_cache: bool = True, refresh_cache: bool = False):
         """
         Initialize the transcription engine.
         
         Args:
             model_name: Whisper model to use (default: "base")
             output_dir: Directory for transcription outputs
+            backend: "faster-whisper" or "whisper"; defaults to faster-whisper when installed
+            chunk_workers: Threads transcribing chunks of one long file in parallel
+                (faster-whisper only; reference Whisper models are not thread-safe)
+            use_cache: Whether to read and write cached transcriptions
+            refresh_cache: Ignore cached transcriptions but store fresh ones
         """
         self.model_name = model_name
         self.output_dir = Path(output_dir)
         self.model = None
+        self.backend = backend or ("faster-whisper" if WhisperModel is not None else "whisper")
+        self.chunk_workers = max(1, chunk_workers)
+        self.device = _detect_device()
+        self.fp16 = self.device == "cuda"  # fp16 stays off on CPU as per FR-003
+        
+        # Transcriptions cached by audio content hash
+        self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
+        self.cache_dir = self.output_dir / ".transcription_cache"
+        
+        # Log-Mel spectrograms of recent short clips, keyed by audio hash
+        self._mel_cache = {}
+        self._max_mel_cache = 4
         
         # Output directory will be created by pipeline orchestrator
         
-        logger.info(f"Transcription engine initialized with model={model_name}, output_dir={output_dir}")
+        logger.info(f"Transcription engine initialized with model={model_name}, backend={self.backend}, device={self.device}, output_dir={output_dir}")
     
     def load_model(self) -> bool:
         """
@@ -47,14 +224,16 @@ class TranscriptionEngine:
             bool: True if model loaded successfully, False otherwise
         """
         try:
-            logger.info(f"Loading Whisper model: {self.model_name}")
+            logger.info(f"Loading Whisper model: {self.model_name} ({self.backend}, {self.device})")
             
-            # Load model with CPU compatibility settings
-            self.model = whisper.load_model(
-                self.model_name,
-                device="cpu",  # Force CPU usage
-                download_root=None  # Use default cache location
-            )
+            if self.backend == "faster-whisper":
+                if WhisperModel is None:
+                    logger.error("faster-whisper backend requested but faster_whisper is not installed")
+                    return False
+                compute_type = "float16" if self.fp16 else "int8"
+                self.model = _load_faster_whisper(self.model_name, self.device, compute_type, self.chunk_workers)
+            else:
+                self.model = _load_whisper(self.model_name, self.device)
             
             logger.info(f"Whisper model loaded successfully: {self.model_name}")
             return True
@@ -63,12 +242,14 @@ class TranscriptionEngine:
             logger.error(f"Failed to load Whisper model: {e}")
             return False
     
-    def transcribe_audio(self, audio_path: str) -> Optional[Dict[str, Any]]:
+    def transcribe_audio(self, audio_path: str, audio: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
         """
         Transcribe audio file from Tamil to English.
         
         Args:
             audio_path: Path to the audio file to transcribe
+            audio: Already decoded float32 16kHz mono samples of audio_path;
+                when given, Whisper skips its own ffmpeg decode
             
         Returns:
             Optional[Dict[str, Any]]: Transcription result with text and metadata
@@ -77,20 +258,29 @@ class TranscriptionEngine:
             logger.error("Whisper model not loaded. Call load_model() first.")
             return None
         
-        if not Path(audio_path).exists():
+        if audio is None and not Path(audio_path).exists():
             logger.error(f"Audio file not found: {audio_path}")
             return None
         
         try:
             logger.info(f"Starting transcription: {audio_path}")
             
-            # Transcribe with CPU-compatible settings
-            result = self.model.transcribe(
-                audio_path,
-                fp16=False,  # CPU compatibility as per FR-003
-                language="ta",  # Tamil language code
-                task="translate"  # Translate to English
-            )
+            # Bound the work per file; a mis-uploaded recording must not run for hours
+            max_samples = MAX_AUDIO_SECONDS * SAMPLE_RATE
+            if audio is not None and len(audio) > max_samples:
+                logger.warning(f"Audio is {len(audio) / SAMPLE_RATE:.0f}s long; only the first {MAX_AUDIO_SECONDS}s will be transcribed")
+                audio = audio[:max_samples]
+            
+            audio_input = audio if audio is not None else audio_path
+            if self.backend == "faster-whisper":
+                if audio is not None and self.chunk_workers > 1 and len(audio) > TRANSCRIPTION_CHUNK_SECONDS * SAMPLE_RATE:
+                    result = self._transcribe_chunked(audio)
+                else:
+                    result = self._transcribe_faster_whisper(audio_input)
+            elif audio is not None:
+                result = self._transcribe_speech_only(audio)
+            else:
+                result = self._transcribe_whisper(audio_input)
             
             # Extract transcription details
             transcription_result = {
@@ -102,9 +292,10 @@ class TranscriptionEngine:
             }
             
             # Calculate confidence score from segments
-            if transcription_result['segments']:
-                avg_confidence = sum(seg.get('avg_logprob', 0) for seg in transcription_result['segments']) / len(transcription_result['segments'])
-                transcription_result['confidence_score'] = avg_confidence
+            segments = transcription_result['segments']
+            if segments:
+                logprobs = np.fromiter((seg.get('avg_logprob', 0.0) for seg in segments), dtype=np.float64, count=len(segments))
+                transcription_result['confidence_score'] = float(logprobs.mean())
             else:
                 transcription_result['confidence_score'] = 0.0
             
@@ -117,6 +308,285 @@ class TranscriptionEngine:
             logger.error(f"Transcription failed: {e}")
             return None
     
+    def _transcribe_whisper(self, audio_input: Any) -> Dict[str, Any]:
+        """
+        Transcribe with reference Whisper.
+        
+        Args:
+            audio_input: Path to the audio file or decoded float32 16kHz samples
+            
+        Returns:
+            Dict[str, Any]: Whisper transcription result
+        """
+        if isinstance(audio_input, np.ndarray) and len(audio_input) <= whisper.audio.N_SAMPLES:
+            return self._decode_single_window(audio_input)
+        
+        # Transcribe with CPU-compatible settings. Only the text is used
+        # downstream, so decode greedily in one pass without timestamp tokens
+        return self.model.transcribe(
+            audio_input,
+            fp16=self.fp16,  # False on CPU as per FR-003
+            language="ta",  # Tamil language code
+            task="translate",  # Translate to English
+            temperature=0.0,
+            condition_on_previous_text=False,
+            without_timestamps=True
+        )
+    
+    def _get_log_mel(self, audio: np.ndarray) -> Any:
+        """
+        Get the log-Mel spectrogram of a clip of at most 30 seconds, computing it once.
+        
+        Args:
+            audio: Decoded float32 16kHz samples
+            
+        Returns:
+            torch.Tensor: Log-Mel spectrogram on the model's device
+        """
+        key = hashlib.blake2b(audio.tobytes(), digest_size=16).hexdigest()
+        mel = self._mel_cache.get(key)
+        if mel is None:
+            mel = whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(audio), n_mels=self.model.dims.n_mels
+            ).to(self.model.device)
+            self._mel_cache[key] = mel
+            while len(self._mel_cache) > self._max_mel_cache:
+                self._mel_cache.pop(next(iter(self._mel_cache)))
+        return mel
+    
+    def _decode_single_window(self, audio: np.ndarray) -> Dict[str, Any]:
+        """
+        Transcribe a clip that fits in one Whisper window, reusing its log-Mel spectrogram.
+        
+        Args:
+            audio: Decoded float32 16kHz samples, at most 30 seconds
+            
+        Returns:
+            Dict[str, Any]: Whisper-shaped transcription result with one segment
+        """
+        mel = self._get_log_mel(audio)
+        
+        options = whisper.DecodingOptions(
+            language="ta",  # Tamil language code
+            task="translate",  # Translate to English
+            temperature=0.0,  # Greedy decoding
+            without_timestamps=True,
+            fp16=self.fp16  # False on CPU as per FR-003
+        )
+        decoded = whisper.decode(self.model, mel, options)
+        
+        return {
+            'text': decoded.text,
+            'language': decoded.language,
+            'segments': [{
+                'id': 0,
+                'seek': 0,
+                'start': 0.0,
+                'end': len(audio) / SAMPLE_RATE,
+                'text': decoded.text,
+                'tokens': decoded.tokens,
+                'temperature': decoded.temperature,
+                'avg_logprob': decoded.avg_logprob,
+                'compression_ratio': decoded.compression_ratio,
+                'no_speech_prob': decoded.no_speech_prob
+            }]
+        }
+    
+    def _transcribe_speech_only(self, audio: np.ndarray) -> Dict[str, Any]:
+        """
+        Transcribe only the speech regions of decoded audio with reference Whisper.
+        
+        Silence is cut out before decoding and segment timestamps are mapped
+        back to positions in the original audio. If the energy detector finds
+        no speech, or hardly any (e.g. a quiet recording that stays under its
+        threshold), the untrimmed audio is transcribed instead.
+        
+        Args:
+            audio: Decoded float32 16kHz samples
+            
+        Returns:
+            Dict[str, Any]: Whisper transcription result
+        """
+        spans = _detect_speech_spans(audio)
+        speech_samples = sum(end - start for start, end in spans)
+        if speech_samples < VAD_MIN_SPEECH_FRACTION * len(audio):
+            logger.warning("Voice activity detection found little or no speech; transcribing the untrimmed audio")
+            return self._transcribe_whisper(audio)
+        
+        logger.info(f"Voice activity detection kept {speech_samples / SAMPLE_RATE:.1f}s of {len(audio) / SAMPLE_RATE:.1f}s audio")
+        
+        result = self._transcribe_whisper(np.concatenate([audio[start:end] for start, end in spans]))
+        
+        # Start of each span in the trimmed audio and in the original audio, in seconds
+        offsets = []
+        trimmed_start = 0
+        for start, end in spans:
+            offsets.append((trimmed_start / SAMPLE_RATE, start / SAMPLE_RATE))
+            trimmed_start += end - start
+        trimmed_starts = np.array([trimmed for trimmed, _ in offsets])
+        
+        def to_original(t: float) -> float:
+            index = max(0, int(np.searchsorted(trimmed_starts, t, side='right')) - 1)
+            trimmed, original = offsets[index]
+            return original + (t - trimmed)
+        
+        for segment in result.get('segments', []):
+            segment['start'] = to_original(segment['start'])
+            segment['end'] = to_original(segment['end'])
+        
+        return result
+    
+    def _transcribe_faster_whisper(self, audio_input: Any) -> Dict[str, Any]:
+        """
+        Transcribe with faster-whisper and return a reference-Whisper shaped result.
+        
+        Args:
+            audio_input: Path to the audio file or decoded float32 16kHz samples
+            
+        Returns:
+            Dict[str, Any]: Result with 'text', 'language' and 'segments' keys
+        """
+        segments, info = self.model.transcribe(
+            audio_input,
+            language="ta",  # Tamil language code
+            task="translate",  # Translate to English
+            beam_size=1,  # Greedy decoding; only the text is used downstream
+            best_of=1,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            without_timestamps=True,
+            vad_filter=True,  # Skip non-speech regions
+            vad_parameters=dict(min_silence_duration_ms=VAD_MIN_SILENCE_MS)
+        )
+        
+        # Segments are generated lazily; decoding happens while consuming them
+        segment_dicts = [
+            {
+                'id': segment.id,
+                'seek': segment.seek,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'tokens': list(segment.tokens),
+                'temperature': getattr(segment, 'temperature', None),
+                'avg_logprob': segment.avg_logprob,
+                'compression_ratio': segment.compression_ratio,
+                'no_speech_prob': segment.no_speech_prob
+            }
+            for segment in segments
+        ]
+        
+        return {
+            'text': ''.join(seg['text'] for seg in segment_dicts),
+            'language': info.language,
+            'segments': segment_dicts
+        }
+    
+    def _transcribe_chunked(self, audio: np.ndarray) -> Dict[str, Any]:
+        """
+        Transcribe long audio as overlapping chunks in parallel with faster-whisper.
+        
+        Each segment is kept by the chunk that owns its midpoint, with chunk
+        ownership switching halfway through each overlap, and the texts are
+        stitched with repeated boundary words removed.
+        
+        Args:
+            audio: Decoded float32 16kHz samples
+            
+        Returns:
+            Dict[str, Any]: Result with 'text', 'language' and 'segments' keys
+        """
+        chunk_len = TRANSCRIPTION_CHUNK_SECONDS * SAMPLE_RATE
+        step = chunk_len - TRANSCRIPTION_CHUNK_OVERLAP_SECONDS * SAMPLE_RATE
+        starts = [0]
+        while starts[-1] + chunk_len < len(audio):
+            starts.append(starts[-1] + step)
+        
+        logger.info(f"Transcribing {len(starts)} chunks with {self.chunk_workers} threads")
+        with ThreadPoolExecutor(max_workers=min(self.chunk_workers, len(starts))) as executor:
+            results = list(executor.map(
+                lambda start: self._transcribe_faster_whisper(audio[start:start + chunk_len]),
+                starts
+            ))
+        
+        half_overlap = TRANSCRIPTION_CHUNK_OVERLAP_SECONDS / 2
+        text = ""
+        segments = []
+        for index, (start, result) in enumerate(zip(starts, results)):
+            offset = start / SAMPLE_RATE
+            lower = offset + half_overlap if index > 0 else 0.0
+            upper = starts[index + 1] / SAMPLE_RATE + half_overlap if index + 1 < len(starts) else float('inf')
+            
+            chunk_text = ""
+            for segment in result['segments']:
+                segment['start'] += offset
+                segment['end'] += offset
+                if lower <= (segment['start'] + segment['end']) / 2 < upper:
+                    segment['id'] = len(segments)
+                    segments.append(segment)
+                    chunk_text += segment['text']
+            text = _stitch_text(text, chunk_text)
+        
+        return {
+            'text': text,
+            'language': results[0]['language'],
+            'segments': segments
+        }
+    
+    def _cache_key(self, audio_path: str) -> Optional[str]:
+        """
+        Build the cache key for an audio file from its content and the transcription settings.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            Optional[str]: Hex digest, or None if the file could not be read
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        # GPU fp16 and CPU int8/fp32 decoding can produce different text for the same audio
+        digest.update(f"{self.CACHE_VERSION}\0{self.backend}\0{self.model_name}\0{self.device}\0{self.fp16}\0".encode())
+        try:
+            with open(audio_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        except OSError as e:
+            logger.warning(f"Could not hash audio for transcription cache: {e}")
+            return None
+        return digest.hexdigest()
+    
+    def _load_cached_transcription(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached transcription result.
+        
+        Args:
+            key: Cache key from _cache_key()
+            
+        Returns:
+            Optional[Dict[str, Any]]: Cached transcription result or None on miss
+        """
+        try:
+            return orjson.loads((self.cache_dir / f"{key}.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+    
+    def _store_cached_transcription(self, key: str, transcription_result: Dict[str, Any]) -> None:
+        """
+        Store a transcription result in the on-disk cache.
+        
+        Args:
+            key: Cache key from _cache_key()
+            transcription_result: Validated transcription result
+        """
+        cache_path = self.cache_dir / f"{key}.json"
+        tmp_path = cache_path.with_name(f"{key}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(orjson.dumps(transcription_result, option=orjson.OPT_SERIALIZE_NUMPY))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to cache transcription: {e}")
+    
     def save_transcription(self, transcription_result: Dict[str, Any], base_filename: str = "transcription") -> bool:
         """
         Save transcription result to file with unique filenames.
@@ -144,8 +614,10 @@ class TranscriptionEngine:
                 f.write(transcription_result['text'])
             
             # Save detailed JSON result
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(transcription_result, f, indent=2, ensure_ascii=False)
+            json_path.write_bytes(orjson.dumps(
+                transcription_result,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ))
             
             logger.info(f"Transcription saved to: {output_path}")
             logger.info(f"Detailed results saved to: {json_path}")
@@ -188,18 +660,31 @@ class TranscriptionEngine:
         logger.info(f"Transcription validation passed. Length: {len(text)}, Confidence: {confidence:.4f}")
         return True
     
-    def process_audio_file(self, audio_path: str) -> Optional[Dict[str, Any]]:
+    def process_audio_file(self, audio_path: str, audio: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
         """
         Complete transcription pipeline for an audio file.
         
         Args:
             audio_path: Path to the audio file
+            audio: Already decoded float32 16kHz mono samples of audio_path
             
         Returns:
             Optional[Dict[str, Any]]: Transcription result
         """
         logger.info(f"Processing audio file for transcription: {audio_path}")
         
+        # Identical audio was already transcribed: reuse the result without loading the model
+        cache_key = self._cache_key(audio_path) if self.use_cache else None
+        if cache_key and not self.refresh_cache:
+            transcription_result = self._load_cached_transcription(cache_key)
+            if transcription_result:
+                logger.info(f"Using cached transcription for {audio_path}")
+                transcription_result['audio_path'] = audio_path
+                if not self.save_transcription(transcription_result):
+                    logger.error("Failed to save transcription")
+                    return None
+                return transcription_result
+        
         # Load model if not already loaded
         if not self.model:
             if not self.load_model():
@@ -207,7 +692,7 @@ class TranscriptionEngine:
                 return None
         
         # Perform transcription
-        transcription_result = self.transcribe_audio(audio_path)
+        transcription_result = self.transcribe_audio(audio_path, audio)
         if not transcription_result:
             logger.error("Transcription failed")
             return None
@@ -222,6 +707,9 @@ class TranscriptionEngine:
             logger.error("Failed to save transcription")
             return None
         
+        if cache_key:
+            self._store_cached_transcription(cache_key, transcription_result)
+        
         logger.info("Transcription pipeline completed successfully")
         return transcription_result
 
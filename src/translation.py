@@ -2,59 +2,399 @@
 Translation Module
 
 Handles English to Tamil translation using googletrans:
-- Uses googletrans library for translation
+- Uses googletrans library for translation, or deep-translator when selected
 - Translates English transcription to Tamil
 - Handles long and multi-line inputs
 - Provides fallback on failure
+- Caches translations in memory and in a SQLite file across runs
 - Saves translation results to files
 """
 
+import functools
+import hashlib
 import logging
-import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from datetime import datetime
+import orjson
+from cachetools import LFUCache
 from constants import TRANSLATION_TXT_PATTERN, TRANSLATION_JSON_PATTERN
 
+try:
+    from deep_translator import GoogleTranslator
+except ImportError:  # optional batch-capable backend
+    GoogleTranslator = None
+
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries; the captured whitespace is kept so text can be reassembled
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])(\s+)')
+
+# Any character from the Tamil Unicode block (U+0B80-U+0BFF)
+_TAMIL_RE = re.compile(r'[\u0B80-\u0BFF]')
+
+# Simple fallback translations for common phrases, highest priority first
+_FALLBACK_PHRASES = {
+    "hello": "வணக்கம்",
+    "world": "உலகம்",
+    "thank you": "நன்றி",
+    "good morning": "காலை வணக்கம்",
+    "good evening": "மாலை வணக்கம்",
+    "how are you": "நீங்கள் எப்படி இருக்கிறீர்கள்",
+    "i am fine": "நான் நன்றாக இருக்கிறேன்",
+    "please": "தயவுசெய்து",
+    "sorry": "மன்னிக்கவும்",
+    "yes": "ஆம்",
+    "no": "இல்லை"
+}
+
+# Read-only view with interned phrase keys, shared by the matcher and the lookups
+FALLBACK_DICT = types.MappingProxyType(
+    {sys.intern(phrase): translation for phrase, translation in _FALLBACK_PHRASES.items()}
+)
+_FALLBACK_PRIORITY = {phrase: index for index, phrase in enumerate(FALLBACK_DICT)}
+
+# Compiled once at import; the lookahead reports a phrase at every position, overlaps included
+_FALLBACK_RE = re.compile(
+    '(?=(' + '|'.join(map(re.escape, FALLBACK_DICT)) + '))'
+)
+
+
+# Bookkeeping flags kept on in-memory results but left out of saved files
+_INTERNAL_RESULT_KEYS = frozenset({'cached'})
+
+# Keys that change on every run and do not count as a content change
+_VOLATILE_RESULT_KEYS = frozenset({'translation_timestamp'})
+
+
+@functools.lru_cache(maxsize=1)
+def _get_translator_cls():
+    """
+    Import googletrans on first use.
+    
+    Returns:
+        type: The googletrans Translator class
+    """
+    from googletrans import Translator
+    return Translator
+
+
+def _has_content(path: Path, data: bytes) -> bool:
+    """
+    Check whether a file already holds exactly the given bytes.
+    
+    Args:
+        path: File to check
+        data: Expected file content
+        
+    Returns:
+        bool: True if the file exists with identical content
+    """
+    try:
+        # Compare sizes first so differing files are usually rejected without a read
+        return path.stat().st_size == len(data) and path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _has_result(path: Path, result: Dict[str, Any]) -> bool:
+    """
+    Check whether a detailed JSON file already holds the given result, ignoring volatile keys.
+    
+    Args:
+        path: Detailed JSON file to check
+        result: Result that would be saved
+        
+    Returns:
+        bool: True if the file exists and differs from result only in volatile keys
+    """
+    try:
+        existing = orjson.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return False
+    if not isinstance(existing, dict):
+        return False
+    
+    def stable(data):
+        return {key: value for key, value in data.items() if key not in _VOLATILE_RESULT_KEYS}
+    
+    return stable(existing) == stable(result)
+
 
 class TranslationEngine:
     """Handles English to Tamil translation using googletrans."""
     
-    def __init__(self, output_dir: str = "output"):
+    # Bump when translation settings change so older cache entries are ignored
+    CACHE_VERSION = "v1"
+    
+    # Bump when validate_translation's rules change so older validations are re-checked
+    VALIDATION_VERSION = "v2"
+    
+    # Translators shared by all engines in this process, keyed by backend
+    _shared_translators = {}
+    _translator_lock = threading.Lock()
+    
+    def __init__(self, output_dir: str = "output", use_cache: bool = True, refresh_cache: bool = False,
+                 backend: Optional[str] = None, translator_factory: Optional[Callable[[], Any]] = None):
         """
         Initialize the translation engine.
         
         Args:
             output_dir: Directory for translation outputs
+            use_cache: Whether to read and write cached translations
+            refresh_cache: Ignore cached translations but store fresh ones
+            backend: "googletrans" or "deep_translator" (batch API); defaults to
+                the TRANSLATION_BACKEND environment variable, then googletrans
+            translator_factory: Builds this engine's own translator instead of the
+                shared backend translator (e.g. a fake translator in tests)
         """
         self.output_dir = Path(output_dir)
+        self.backend = backend or os.getenv('TRANSLATION_BACKEND', 'googletrans')
+        self.translator_factory = translator_factory
         self.translator = None
+        self.max_concurrency = 4  # sentence translations in flight at once
+        
+        # Translations cached in memory and in output_dir/.translation_cache.db;
+        # the in-memory cache keeps the most frequently used sentences only
+        self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
+        self.cache_path = self.output_dir / ".translation_cache.db"
+        self._mem_cache = LFUCache(maxsize=4096)
+        self._validated_keys = set()
+        self._cache_db = None
+        self._cache_lock = threading.Lock()
         
         # Output directory will be created by pipeline orchestrator
         
-        logger.info(f"Translation engine initialized with output_dir={output_dir}")
+        logger.info(f"Translation engine initialized with backend={self.backend}, output_dir={output_dir}")
+    
+    def close(self) -> None:
+        """Close the translation cache database."""
+        with self._cache_lock:
+            if self._cache_db is not None:
+                self._cache_db.close()
+                self._cache_db = None
+    
+    def _cache_key(self, text: str, src: str, dest: str) -> str:
+        """
+        Build the cache key for a text and language pair.
+        
+        Args:
+            text: Source text
+            src: Source language code
+            dest: Target language code
+            
+        Returns:
+            str: Hex digest of the versioned text
+        """
+        return hashlib.sha256(f"{self.CACHE_VERSION}:{self.backend}:{src}:{dest}:{text}".encode('utf-8')).hexdigest()
+    
+    def _get_cache_db(self) -> Optional[sqlite3.Connection]:
+        """
+        Open the translation cache database on first use.
+        
+        Must be called with _cache_lock held.
+        
+        Returns:
+            Optional[sqlite3.Connection]: Cache connection, or None if it could not be opened
+        """
+        if self._cache_db is None:
+            try:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+                # WAL lets concurrent readers proceed during writes; NORMAL syncs only at checkpoints
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute("PRAGMA temp_store=MEMORY")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS translate_cache ("
+                    "hash TEXT PRIMARY KEY, src TEXT, dest TEXT, translated TEXT, ts REAL)"
+                )
+                db.execute("CREATE TABLE IF NOT EXISTS validated_cache (hash TEXT PRIMARY KEY)")
+                self._cache_db = db
+            except sqlite3.Error as e:
+                logger.warning(f"Translation cache unavailable: {e}")
+                self.use_cache = False
+        return self._cache_db
+    
+    def _load_cached_translation(self, key: str, src: str, dest: str) -> Optional[str]:
+        """
+        Look up a cached translation, first in memory and then on disk.
+        
+        Args:
+            key: Cache key from _cache_key()
+            src: Source language code
+            dest: Target language code
+            
+        Returns:
+            Optional[str]: Cached translated text or None on miss
+        """
+        if not self.use_cache or self.refresh_cache:
+            return None
+        
+        translated = self._mem_cache.get((src, dest, key))
+        if translated is not None:
+            return translated
+        
+        with self._cache_lock:
+            db = self._get_cache_db()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT translated FROM translate_cache WHERE hash=? AND dest=?", (key, dest)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read translation cache: {e}")
+                return None
+        
+        if row is None:
+            return None
+        self._mem_cache[(src, dest, key)] = row[0]
+        return row[0]
+    
+    def _store_cached_translations(self, entries: List[Tuple[str, str]], src: str, dest: str) -> None:
+        """
+        Store translations in memory and in the on-disk cache in one transaction.
+        
+        Args:
+            entries: (cache key from _cache_key(), translated text) pairs
+            src: Source language code
+            dest: Target language code
+        """
+        if not self.use_cache or not entries:
+            return
+        
+        for key, translated in entries:
+            self._mem_cache[(src, dest, key)] = translated
+        now = time.time()
+        with self._cache_lock:
+            db = self._get_cache_db()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO translate_cache VALUES (?, ?, ?, ?, ?)",
+                        [(key, src, dest, translated, now) for key, translated in entries]
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to cache translation: {e}")
+    
+    def _validation_key(self, translation_result: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a validated original/translated text pair.
+        
+        Args:
+            translation_result: Translation result
+            
+        Returns:
+            str: Hex digest of the versioned text pair
+        """
+        return self._cache_key(
+            f"{self.VALIDATION_VERSION}\0{translation_result['original_text']}\0{translation_result['translated_text']}",
+            translation_result['source_language'],
+            translation_result['target_language']
+        )
+    
+    def _is_validation_cached(self, key: str) -> bool:
+        """
+        Check whether a translation already passed validation, in memory or on disk.
+        
+        Args:
+            key: Cache key from _validation_key()
+            
+        Returns:
+            bool: True if the translation was validated before
+        """
+        if not self.use_cache or self.refresh_cache:
+            return False
+        
+        if key in self._validated_keys:
+            return True
+        
+        with self._cache_lock:
+            db = self._get_cache_db()
+            if db is None:
+                return False
+            try:
+                row = db.execute("SELECT 1 FROM validated_cache WHERE hash=?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read translation cache: {e}")
+                return False
+        
+        if row is None:
+            return False
+        self._validated_keys.add(key)
+        return True
+    
+    def _store_validation(self, key: str) -> None:
+        """
+        Record that a translation passed validation, in memory and on disk.
+        
+        Args:
+            key: Cache key from _validation_key()
+        """
+        if not self.use_cache or key in self._validated_keys:
+            return
+        
+        self._validated_keys.add(key)
+        with self._cache_lock:
+            db = self._get_cache_db()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute("INSERT OR IGNORE INTO validated_cache VALUES (?)", (key,))
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to cache translation: {e}")
     
     def load_translator(self) -> bool:
         """
-        Load the googletrans translator.
+        Load the translator for the configured backend.
+        
+        The translator (and the connection pool it owns) is created once per
+        process and backend and shared by every engine.
         
         Returns:
             bool: True if translator loaded successfully, False otherwise
         """
         try:
-            logger.info("Loading googletrans translator")
+            logger.info(f"Loading {self.backend} translator")
             
-            from googletrans import Translator
-            self.translator = Translator()
+            if self.translator_factory is not None:
+                self.translator = self.translator_factory()
+                logger.info("Translator created by translator_factory")
+                return True
             
-            logger.info("googletrans translator loaded successfully")
+            with TranslationEngine._translator_lock:
+                translator = TranslationEngine._shared_translators.get(self.backend)
+                if translator is None:
+                    if self.backend == "deep_translator":
+                        if GoogleTranslator is None:
+                            logger.error("deep_translator backend requested but deep-translator is not installed")
+                            return False
+                        translator = GoogleTranslator(source='en', target='ta')
+                    else:
+                        import httpx
+                        translator = _get_translator_cls()(timeout=httpx.Timeout(10.0))
+                    TranslationEngine._shared_translators[self.backend] = translator
+                self.translator = translator
+            
+            logger.info(f"{self.backend} translator loaded successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to load googletrans translator: {e}")
+            logger.error(f"Failed to load {self.backend} translator: {e}")
             return False
     
     def translate_text(self, english_text: str) -> Optional[Dict[str, Any]]:
@@ -75,30 +415,51 @@ class TranslationEngine:
             logger.error("Input text is empty")
             return None
         
+        # One timestamp for the whole call, shared with the fallback path
+        timestamp = datetime.now().isoformat()
+        
         try:
             logger.info(f"Starting translation. Input length: {len(english_text)} characters")
             
-            # Translate English to Tamil
-            translation_result = self.translator.translate(
-                english_text,
-                src='en',
-                dest='ta'
-            )
+            # Split into sentences, keeping the whitespace between them for reassembly
+            parts = SENTENCE_SPLIT_RE.split(english_text)
+            sentences = parts[0::2]
             
-            # Check if translation was successful
-            if not translation_result or not hasattr(translation_result, 'text'):
-                logger.error("Translation result is invalid or empty")
-                return None
+            # Translate each distinct sentence once, and only if it is not cached
+            translations = {}
+            misses = []
+            for sentence in dict.fromkeys(s for s in sentences if s.strip()):
+                cached_text = self._load_cached_translation(self._cache_key(sentence, 'en', 'ta'), 'en', 'ta')
+                if cached_text is not None:
+                    translations[sentence] = cached_text
+                else:
+                    misses.append(sentence)
+            
+            if misses:
+                logger.info(f"Translating {len(misses)} of {len(misses) + len(translations)} unique sentences")
+                translated_misses = self._translate_batch(misses)
+                translations.update(zip(misses, translated_misses))
+                self._store_cached_translations(
+                    [(self._cache_key(sentence, 'en', 'ta'), translated_text)
+                     for sentence, translated_text in zip(misses, translated_misses)],
+                    'en', 'ta'
+                )
+            else:
+                logger.info("Using cached translation")
+            
+            # Reassemble, keeping the original separators
+            parts[0::2] = [translations.get(sentence, sentence) for sentence in sentences]
             
-            # Extract translation details
             result = {
                 'original_text': english_text,
-                'translated_text': translation_result.text,
-                'source_language': translation_result.src,
-                'target_language': translation_result.dest,
-                'confidence': getattr(translation_result, 'confidence', None),
-                'translation_timestamp': datetime.now().isoformat()
+                'translated_text': ''.join(parts),
+                'source_language': 'en',
+                'target_language': 'ta',
+                'confidence': None,
+                'translation_timestamp': timestamp
             }
+            if not misses:
+                result['cached'] = True
             
             logger.info(f"Translation completed. Output length: {len(result['translated_text'])} characters")
             
@@ -108,7 +469,7 @@ class TranslationEngine:
             logger.error(f"Translation failed: {e}")
             # Try to provide a fallback translation for common phrases
             try:
-                fallback_result = self._fallback_translation(english_text)
+                fallback_result = self._fallback_translation(english_text, timestamp)
                 if fallback_result:
                     logger.info("Using fallback translation")
                     return fallback_result
@@ -117,45 +478,69 @@ class TranslationEngine:
             
             return None
     
-    def _fallback_translation(self, english_text: str) -> Optional[Dict[str, Any]]:
+    def _translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Translate several English texts to Tamil.
+        
+        The deep_translator backend takes them as one translate_batch call. With googletrans
+        they are translated concurrently over the shared translator's HTTP/2
+        connection, up to max_concurrency requests at a time.
+        
+        Args:
+            texts: English texts to translate
+            
+        Returns:
+            List[str]: Tamil translations, in the same order as texts
+        """
+        if self.backend == "deep_translator":
+            translations = self.translator.translate_batch(texts)
+            if not translations or len(translations) != len(texts) or not all(translations):
+                raise ValueError("Translation result is invalid or empty")
+            return translations
+        
+        def translate_one(text: str) -> str:
+            translation_result = self.translator.translate(text, src='en', dest='ta')
+            # Check if translation was successful
+            if not translation_result or not hasattr(translation_result, 'text'):
+                raise ValueError("Translation result is invalid or empty")
+            return translation_result.text
+        
+        if len(texts) == 1 or self.max_concurrency <= 1:
+            return [translate_one(text) for text in texts]
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(texts))) as executor:
+            return list(executor.map(translate_one, texts))
+    
+    def _fallback_translation(self, english_text: str, timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Provide fallback translation for common phrases when googletrans fails.
         
         Args:
             english_text: English text to translate
+            timestamp: ISO timestamp for the result (default: now)
             
         Returns:
             Optional[Dict[str, Any]]: Fallback translation result
         """
-        # Simple fallback translations for common phrases
-        fallback_dict = {
-            "hello": "வணக்கம்",
-            "world": "உலகம்",
-            "thank you": "நன்றி",
-            "good morning": "காலை வணக்கம்",
-            "good evening": "மாலை வணக்கம்",
-            "how are you": "நீங்கள் எப்படி இருக்கிறீர்கள்",
-            "i am fine": "நான் நன்றாக இருக்கிறேன்",
-            "please": "தயவுசெய்து",
-            "sorry": "மன்னிக்கவும்",
-            "yes": "ஆம்",
-            "no": "இல்லை"
-        }
+        timestamp = timestamp or datetime.now().isoformat()
         
-        # Check if the text matches any fallback phrases
-        english_lower = english_text.lower().strip()
-        for phrase, translation in fallback_dict.items():
-            if phrase in english_lower:
-                result = {
-                    'original_text': english_text,
-                    'translated_text': translation,
-                    'source_language': 'en',
-                    'target_language': 'ta',
-                    'confidence': 0.5,  # Lower confidence for fallback
-                    'translation_timestamp': datetime.now().isoformat(),
-                    'fallback_used': True
-                }
-                return result
+        # Check if the text matches any fallback phrases; one regex pass over the
+        # casefolded text finds every phrase occurrence and the earliest phrase in
+        # FALLBACK_DICT wins (surrounding whitespace cannot affect a match)
+        matches = [match.group(1) for match in _FALLBACK_RE.finditer(english_text.casefold())]
+        if matches:
+            phrase = min(matches, key=_FALLBACK_PRIORITY.__getitem__)
+            translation = FALLBACK_DICT[phrase]
+            result = {
+                'original_text': english_text,
+                'translated_text': translation,
+                'source_language': 'en',
+                'target_language': 'ta',
+                'confidence': 0.5,  # Lower confidence for fallback
+                'translation_timestamp': timestamp,
+                'fallback_used': True
+            }
+            return result
         
         # If no fallback found, return a simple transliteration
         logger.warning("No fallback translation available, using transliteration")
@@ -165,7 +550,7 @@ class TranslationEngine:
             'source_language': 'en',
             'target_language': 'ta',
             'confidence': 0.1,  # Very low confidence
-            'translation_timestamp': datetime.now().isoformat(),
+            'translation_timestamp': timestamp,
             'fallback_used': True,
             'transliteration': True
         }
@@ -190,12 +575,19 @@ class TranslationEngine:
             json_filename = TRANSLATION_JSON_PATTERN.format(audio_name=base_filename)
             json_path = self.output_dir / json_filename
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(translation_result['translated_text'])
+            # Files that already hold identical content (e.g. on a re-run) are left untouched
+            text_data = translation_result['translated_text'].encode('utf-8')
+            if not _has_content(output_path, text_data):
+                output_path.write_bytes(text_data)
             
-            # Save detailed JSON result
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(translation_result, f, indent=2, ensure_ascii=False)
+            # Save detailed JSON result, replacing any previous file atomically; a
+            # re-run that only produced a new timestamp keeps the existing file
+            saved_result = {key: value for key, value in translation_result.items() if key not in _INTERNAL_RESULT_KEYS}
+            if not _has_result(json_path, saved_result):
+                json_data = orjson.dumps(saved_result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                tmp_path = json_path.with_name(f"{json_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(json_data)
+                os.replace(tmp_path, json_path)
             
             logger.info(f"Translation saved to: {output_path}")
             logger.info(f"Detailed results saved to: {json_path}")
@@ -218,6 +610,10 @@ class TranslationEngine:
         if not translation_result:
             return False
         
+        # A fully cached translation that passed validation before needs no re-check
+        if translation_result.get('cached') and self._is_validation_cached(self._validation_key(translation_result)):
+            return True
+        
         original_text = translation_result.get('original_text', '')
         translated_text = translation_result.get('translated_text', '')
         
@@ -234,9 +630,9 @@ class TranslationEngine:
             logger.warning("Translated text is too short")
             return False
         
-        # Check if translation contains Tamil characters (basic validation)
-        tamil_chars = any(ord(char) > 127 for char in translated_text)
-        if not tamil_chars:
+        # Check if translation contains Tamil characters (basic validation);
+        # the regex scan stops at the first character from the Tamil block
+        if not _TAMIL_RE.search(translated_text):
             logger.warning("Translated text doesn't appear to contain Tamil characters")
             return False
         
@@ -273,6 +669,9 @@ class TranslationEngine:
             logger.warning("Translation validation failed")
             return None
         
+        if not translation_result.get('fallback_used'):
+            self._store_validation(self._validation_key(translation_result))
+        
         # Save translation
         if not self.save_translation(translation_result, base_filename):
             logger.error("Failed to save translation")
@@ -7,35 +7,159 @@ Handles Tamil text-to-speech using gTTS:
 - Saves output as MP3 or WAV
 - Supports language code 'ta'
 - Provides audio file path for playback
+- Caches generated audio by text so identical text is not synthesized twice
 """
 
+import functools
+import hashlib
+import io
 import logging
 import json
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from constants import TTS_AUDIO_PATTERN, TTS_METADATA_PATTERN
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries used to split long text into independent gTTS requests
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?\u0964])\s+')
+
+# gTTS rejects text with nothing to speak, such as a lone "..."
+_WORD_RE = re.compile(r'\w')
+
+
+def _split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences for separate gTTS requests.
+    
+    Pieces without any word characters (e.g. an ellipsis between sentences)
+    are joined to a neighbouring sentence instead of becoming a request.
+    
+    Args:
+        text: Tamil text to split
+        
+    Returns:
+        List[str]: Sentences that each contain speakable text
+    """
+    chunks = []
+    leading = ""
+    for chunk in SENTENCE_SPLIT_RE.split(text.strip()):
+        if _WORD_RE.search(chunk):
+            chunks.append(leading + chunk)
+            leading = ""
+        elif chunks:
+            chunks[-1] += " " + chunk
+        elif chunk:
+            leading += chunk + " "
+    return chunks
+
+
+@functools.lru_cache(maxsize=1)
+def _get_gtts_cls():
+    """
+    Import gTTS on first use.
+    
+    Returns:
+        type: The gTTS class
+    """
+    from gtts import gTTS
+    return gTTS
+
 
 class TTSEngine:
     """Handles Tamil text-to-speech using gTTS."""
     
-    def __init__(self, output_dir: str = "output"):
+    # Bump when speech settings change so older cache entries are ignored
+    CACHE_VERSION = "v1"
+    
+    def __init__(self, output_dir: str = "output", use_cache: bool = True, refresh_cache: bool = False):
         """
         Initialize the TTS engine.
         
         Args:
             output_dir: Directory for TTS outputs
+            use_cache: Whether to read and write cached speech audio
+            refresh_cache: Ignore cached speech audio but store fresh audio
         """
         self.output_dir = Path(output_dir)
         
+        # Generated audio cached by text in output_dir/.tts_cache
+        self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
+        self.cache_dir = self.output_dir / ".tts_cache"
+        self.max_concurrency = 4  # gTTS requests in flight at once
+        
         # Output directory will be created by pipeline orchestrator
         
         logger.info(f"TTS engine initialized with output_dir={output_dir}")
     
+    def _cache_key(self, text: str, lang: str) -> str:
+        """
+        Build the cache key for a text and language.
+        
+        Args:
+            text: Text to convert to speech
+            lang: gTTS language code
+            
+        Returns:
+            str: Hex digest of the versioned text
+        """
+        return hashlib.md5(f"{self.CACHE_VERSION}:{lang}:{text}".encode('utf-8')).hexdigest()
+    
+    def _load_cached_speech(self, key: str, audio_path: Path) -> bool:
+        """
+        Copy cached speech audio to the output path.
+        
+        Args:
+            key: Cache key from _cache_key()
+            audio_path: Destination audio file
+            
+        Returns:
+            bool: True on a cache hit, False otherwise
+        """
+        try:
+            shutil.copyfile(self.cache_dir / f"{key}.mp3", audio_path)
+            return True
+        except OSError:
+            return False
+    
+    def _store_cached_speech(self, key: str, audio_path: Path) -> None:
+        """
+        Store generated speech audio in the on-disk cache.
+        
+        Args:
+            key: Cache key from _cache_key()
+            audio_path: Generated audio file
+        """
+        cache_path = self.cache_dir / f"{key}.mp3"
+        tmp_path = cache_path.with_name(f"{key}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(audio_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to cache speech audio: {e}")
+    
+    def _synthesize(self, text: str) -> bytes:
+        """
+        Generate MP3 audio for one chunk of Tamil text with gTTS.
+        
+        Args:
+            text: Tamil text to convert to speech
+            
+        Returns:
+            bytes: MP3 audio
+        """
+        buffer = io.BytesIO()
+        _get_gtts_cls()(text=text, lang='ta', slow=False).write_to_fp(buffer)
+        return buffer.getvalue()
+    
     def generate_speech(self, tamil_text: str, base_filename: str = "tamil_speech") -> Optional[Dict[str, Any]]:
         """
         Generate Tamil speech from text using gTTS.
@@ -47,25 +171,40 @@ class TTSEngine:
         Returns:
             Optional[Dict[str, Any]]: TTS result with audio file path and metadata
         """
-        if not tamil_text.strip():
+        if not tamil_text or not tamil_text.strip():
             logger.error("Input text is empty")
             return None
         
         try:
             logger.info(f"Starting TTS generation. Text length: {len(tamil_text)} characters")
             
-            from gtts import gTTS
-            
-            # Generate speech using gTTS
-            tts = gTTS(text=tamil_text, lang='ta', slow=False)
-            
             # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             audio_filename = TTS_AUDIO_PATTERN.format(base_filename=base_filename, timestamp=timestamp)
             audio_path = self.output_dir / audio_filename
             
-            # Save audio file
-            tts.save(str(audio_path))
+            cache_key = self._cache_key(tamil_text, 'ta') if self.use_cache else None
+            if cache_key and not self.refresh_cache and self._load_cached_speech(cache_key, audio_path):
+                logger.info("Using cached speech audio")
+            else:
+                chunks = _split_sentences(tamil_text)
+                if len(chunks) > 1 and self.max_concurrency > 1:
+                    # Sentences are requested concurrently; MP3 frames are independent,
+                    # so the chunks can be joined byte for byte
+                    logger.info(f"Generating speech for {len(chunks)} sentences concurrently")
+                    with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+                        audio_path.write_bytes(b''.join(executor.map(self._synthesize, chunks)))
+                else:
+                    # Generate speech using gTTS
+                    tts = _get_gtts_cls()(text=tamil_text, lang='ta', slow=False)
+                    
+                    # Stream audio straight into the output file
+                    with open(audio_path, 'wb') as fp:
+                        tts.write_to_fp(fp)
+                
+                if cache_key:
+                    self._store_cached_speech(cache_key, audio_path)
             
             # Create result dictionary
             result = {
@@ -74,7 +213,7 @@ class TTSEngine:
                 'audio_filename': audio_filename,
                 'language_code': 'ta',
                 'text_length': len(tamil_text),
-                'tts_timestamp': datetime.now().isoformat(),
+                'tts_timestamp': now.isoformat(),
                 'audio_format': 'mp3'
             }
             
@@ -85,6 +224,18 @@ class TTSEngine:
             logger.error(f"TTS generation failed: {e}")
             return None
     
+    def serialize_tts_metadata(self, tts_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the JSON-compatible metadata that save_tts_metadata() writes.
+        
+        Args:
+            tts_result: TTS result dictionary
+            
+        Returns:
+            Dict[str, Any]: Metadata with paths converted to strings
+        """
+        return {key: str(value) if isinstance(value, Path) else value for key, value in tts_result.items()}
+    
     def save_tts_metadata(self, tts_result: Dict[str, Any], base_filename: str = "tamil_speech") -> bool:
         """
         Save TTS metadata to JSON file.
@@ -101,8 +252,8 @@ class TTSEngine:
             metadata_filename = TTS_METADATA_PATTERN.format(base_filename=base_filename)
             metadata_path = self.output_dir / metadata_filename
             
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(tts_result, f, indent=2, ensure_ascii=False)
+            metadata = self.serialize_tts_metadata(tts_result)
+            metadata_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding='utf-8')
             
             logger.info(f"TTS metadata saved to: {metadata_path}")
             return True
@@ -137,12 +288,15 @@ class TTSEngine:
             return False
         
         # Check if audio file exists and has reasonable size
-        audio_file = Path(audio_path)
-        if not audio_file.exists():
+        try:
+            file_size = os.stat(audio_path).st_size
+        except FileNotFoundError:
             logger.warning("Audio file does not exist")
             return False
+        except OSError as e:
+            logger.warning(f"Cannot access audio file: {e}")
+            return False
         
-        file_size = audio_file.stat().st_size
         if file_size < 1024:  # Less than 1KB
             logger.warning(f"Audio file is too small: {file_size} bytes")
             return False
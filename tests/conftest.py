@@ -0,0 +1,106 @@
+"""
+Shared pytest fixtures for the pipeline test suite.
+
+gTTS is replaced by an offline fake in every test; tests marked
+``integration`` call the live services and only run with --run-integration.
+Live speech is cached in tests/.tts_cache across runs (regenerate with --no-tts-cache).
+Temporary files go to $PYTEST_TMPDIR or $TMPDIR if set, otherwise to the
+RAM-backed /dev/shm on Linux.
+"""
+
+import os
+import tempfile
+import pytest
+from pathlib import Path
+import sys
+
+import tts
+from tts import TTSEngine
+
+# Tamil texts synthesized once per test session
+TAMIL_TTS_TEXTS = {
+    "short": "வணக்கம் உலகம்",
+    "long": "இது ஒரு நீண்ட உரை ஆகும். இது பல வாக்கியங்களைக் கொண்டுள்ளது."
+}
+
+# Live gTTS output kept across test runs
+TTS_CACHE_DIR = Path(__file__).parent / ".tts_cache"
+
+# Eight silent MPEG-1 Layer III frames (128 kbit/s, 44.1 kHz, 417 bytes each)
+SILENT_MP3 = (b"\xff\xfb\x90\x64" + bytes(413)) * 8
+
+
+class FakeGTTS:
+    """Offline stand-in for gtts.gTTS that writes a fixed MP3 payload."""
+    
+    def __init__(self, text, lang='ta', slow=False):
+        self.text = text
+        self.lang = lang
+    
+    def write_to_fp(self, fp):
+        fp.write(SILENT_MP3)
+    
+    def save(self, savefile):
+        Path(savefile).write_bytes(SILENT_MP3)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        help="Run tests marked integration, which call live network services"
+    )
+    parser.addoption(
+        "--no-tts-cache",
+        action="store_true",
+        help="Call the live gTTS service instead of reusing tests/.tts_cache, then refresh the cache"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "integration: calls live network services; needs --run-integration")
+    
+    # Both tempfile.mkdtemp() and pytest's tmp_path live under tempfile.gettempdir()
+    temp_root = (os.environ.get("PYTEST_TMPDIR") or os.environ.get("TMPDIR")
+                 or ("/dev/shm" if sys.platform.startswith("linux") else None))
+    if temp_root and os.path.isdir(temp_root) and os.access(temp_root, os.W_OK):
+        tempfile.tempdir = temp_root
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-integration"):
+        return
+    skip_integration = pytest.mark.skip(reason="integration test; use --run-integration to run")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
+
+@pytest.fixture(autouse=True)
+def _mock_gtts(request, monkeypatch):
+    """Replace gTTS with FakeGTTS except in integration tests."""
+    if request.node.get_closest_marker("integration") is None:
+        monkeypatch.setattr(tts, "_get_gtts_cls", lambda: FakeGTTS)
+
+
+@pytest.fixture(scope="session")
+def tamil_tts_samples(tmp_path_factory):
+    """Synthesize each sample text once with FakeGTTS and share the TTS results across tests."""
+    engine = TTSEngine(output_dir=str(tmp_path_factory.mktemp("tts")))
+    # Session fixtures are set up before the per-test gTTS mock, so patch here as well
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(tts, "_get_gtts_cls", lambda: FakeGTTS)
+        return {name: engine.generate_speech(text, name) for name, text in TAMIL_TTS_TEXTS.items()}
+
+
+@pytest.fixture(scope="session")
+def live_tamil_tts_samples(request, tmp_path_factory):
+    """Synthesize each sample text once with the real gTTS service, or reuse tests/.tts_cache."""
+    engine = TTSEngine(
+        output_dir=str(tmp_path_factory.mktemp("tts_live")),
+        use_cache=True,
+        refresh_cache=request.config.getoption("--no-tts-cache")
+    )
+    # Keep live audio across runs instead of in the per-session output directory
+    engine.cache_dir = TTS_CACHE_DIR
+    return {name: engine.generate_speech(text, name) for name, text in TAMIL_TTS_TEXTS.items()}
@@ -0,0 +1,151 @@
+"""
+Test API Client Module
+
+Tests for the Gemini API client, with the HTTP session mocked out.
+"""
+
+import pytest
+import tempfile
+import orjson
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+from api_client import GeminiAPIClient
+
+TEST_API_KEY = "test-api-key-0123456789"
+
+SAMPLE_RESPONSE = {
+    "candidates": [{"content": {"parts": [{"text": "Generated answer"}]}, "finishReason": "STOP"}]
+}
+
+
+def make_response(status_code, content=b"", headers=None):
+    """Build a mocked streamed requests.Response."""
+    response = MagicMock(status_code=status_code, content=content, headers=headers or {})
+    response.iter_content.side_effect = lambda chunk_size: iter([content])
+    return response
+
+
+class TestGeminiAPIClient:
+    """Test cases for GeminiAPIClient."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.api_client = GeminiAPIClient(output_dir=self.temp_dir)
+        self.api_client.api_key = TEST_API_KEY
+        self.api_client._session = MagicMock()
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        self.api_client.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_batch_prompt_round_trip(self):
+        """Test that a batched answer splits back into per-transcription answers."""
+        prompt = self.api_client.format_batch_prompt(["first text", "second text"])
+        assert "---BEGIN 1---\nfirst text\n---END 1---" in prompt
+        assert "---BEGIN 2---\nsecond text\n---END 2---" in prompt
+
+        generated_text = "---BEGIN 1---\nAnswer one\n---END 1---\n---BEGIN 2---\nAnswer two\n---END 2---"
+        answers = self.api_client.split_batch_response(generated_text, 2)
+        assert answers == ["Answer one", "Answer two"]
+
+    def test_split_batch_response_missing_answer(self):
+        """Test that an incomplete batched answer is rejected."""
+        generated_text = "---BEGIN 1---\nAnswer one\n---END 1---"
+        assert self.api_client.split_batch_response(generated_text, 2) is None
+
+    def test_cached_response_skips_request(self):
+        """Test that a repeated prompt is answered from the cache without an HTTP request."""
+        self.api_client._session.post.return_value = make_response(200, orjson.dumps(SAMPLE_RESPONSE))
+
+        assert self.api_client.make_api_request("Hello") == SAMPLE_RESPONSE
+        assert self.api_client.make_api_request("Hello") == SAMPLE_RESPONSE
+        assert self.api_client._session.post.call_count == 1
+        assert self.api_client._load_cached_response(self.api_client._cache_key("Hello")) == SAMPLE_RESPONSE
+
+    def test_refresh_cache_bypasses_cached_response(self):
+        """Test that refresh_cache sends the request anyway and replaces the cached response."""
+        stale_response = {"candidates": [{"content": {"parts": [{"text": "Stale answer"}]}}]}
+        self.api_client._store_cached_response(self.api_client._cache_key("Hello"), stale_response)
+
+        refresh_client = GeminiAPIClient(output_dir=self.temp_dir, refresh_cache=True)
+        refresh_client.api_key = TEST_API_KEY
+        refresh_client._session = MagicMock()
+        refresh_client._session.post.return_value = make_response(200, orjson.dumps(SAMPLE_RESPONSE))
+
+        assert refresh_client.make_api_request("Hello") == SAMPLE_RESPONSE
+        refresh_client._session.post.assert_called_once()
+        assert self.api_client._load_cached_response(self.api_client._cache_key("Hello")) == SAMPLE_RESPONSE
+        refresh_client.close()
+
+    @pytest.mark.parametrize("retry_after, expected_delay", [
+        ("7", 7.0),
+        (timedelta(seconds=30), 30.0),
+        ("3600", 60.0),
+        (timedelta(hours=1), 60.0),
+    ], ids=["seconds", "http-date", "seconds-capped", "http-date-capped"])
+    def test_rate_limit_waits_for_retry_after(self, retry_after, expected_delay):
+        """Test that a 429 response waits as long as its Retry-After header asks before retrying."""
+        if isinstance(retry_after, timedelta):
+            retry_after = format_datetime(datetime.now(timezone.utc) + retry_after, usegmt=True)
+        self.api_client.use_cache = False
+        self.api_client._session.post.side_effect = [
+            make_response(429, headers={"Retry-After": retry_after}),
+            make_response(200, orjson.dumps(SAMPLE_RESPONSE)),
+        ]
+
+        with patch("api_client.time.sleep") as sleep, patch("api_client.random.uniform", return_value=0.0):
+            assert self.api_client.make_api_request("Hello") == SAMPLE_RESPONSE
+
+        assert self.api_client._session.post.call_count == 2
+        (delay,), _ = sleep.call_args
+        # HTTP-dates have one-second resolution and the clock moves on while the test runs
+        assert expected_delay - 2 <= delay <= expected_delay
+
+    def test_error_response_logs_truncated_body(self, caplog):
+        """Test that an error response logs only the start of its body."""
+        response = make_response(400, b"x" * 2000)
+        self.api_client._session.post.return_value = response
+
+        assert self.api_client.make_api_request("Hello") is None
+
+        response.iter_content.assert_called_once_with(chunk_size=512)
+        response.close.assert_called_once()
+        assert "Bad request: " + "x" * 512 in caplog.text
+        assert "x" * 513 not in caplog.text
+
+    def test_oversized_prompt_rejected_without_request(self):
+        """Test that a prompt over max_prompt_chars is rejected before any HTTP request."""
+        self.api_client.max_prompt_chars = 10
+
+        assert self.api_client.make_api_request("x" * 11) is None
+        self.api_client._session.post.assert_not_called()
+
+    def test_flush_reports_failed_writes(self):
+        """Test that response files the background writer could not write are reported by flush()."""
+        missing_dir = f"{self.temp_dir}/missing"
+        client = GeminiAPIClient(output_dir=missing_dir)
+
+        assert client.save_api_response({"generated_text": "Answer"}, "audio_api_response") is True
+        failed_writes = client.flush()
+
+        assert sorted(path.suffix for path in failed_writes) == [".json", ".txt"]
+        assert all(path.name.startswith("audio_api_response_") for path in failed_writes)
+        assert client.close() == []
+
+    def test_close_stops_writer_thread(self):
+        """Test that close() writes pending response files and stops the background writer."""
+        assert self.api_client.save_api_response({"generated_text": "Answer"}, "audio_api_response") is True
+        writer = self.api_client._io_thread
+
+        assert self.api_client.close() == []
+        assert not writer.is_alive()
+        assert len(list(self.api_client.output_dir.glob("audio_api_response_*"))) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
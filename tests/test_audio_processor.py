@@ -7,10 +7,9 @@ from unittest.mock import patch, MagicMock
 from pathlib import Path
 import tempfile
 import shutil
+import wave
 
-# Add src to path for imports
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import numpy as np
 
 from audio_processor import AudioProcessor
 
@@ -58,6 +57,14 @@ class TestAudioProcessor(unittest.TestCase):
         result = processor.validate_audio_file(nonexistent_file)
         self.assertFalse(result)
     
+    def test_validate_audio_file_inaccessible(self):
+        """Test audio file validation when the path cannot be stat'ed."""
+        processor = AudioProcessor(str(self.input_dir), str(self.output_dir))
+        
+        # A regular file used as a directory raises NotADirectoryError
+        result = processor.validate_audio_file(self.mock_mp3 / "nested.mp3")
+        self.assertFalse(result)
+    
     def test_validate_audio_file_wrong_format(self):
         """Test audio file validation with wrong format."""
         processor = AudioProcessor(str(self.input_dir), str(self.output_dir))
@@ -82,6 +89,7 @@ class TestAudioProcessor(unittest.TestCase):
         self.assertIn("audio1.mp3", files)
         self.assertIn("audio2.mp3", files)
     
+    @patch('audio_processor.av', None)
     @patch('audio_processor.ffmpeg')
     def test_convert_mp3_to_wav_success(self, mock_ffmpeg):
         """Test successful MP3 to WAV conversion."""
@@ -97,6 +105,7 @@ class TestAudioProcessor(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertTrue(result.endswith("test_converted.wav"))
     
+    @patch('audio_processor.av', None)
     @patch('audio_processor.ffmpeg')
     def test_convert_mp3_to_wav_failure(self, mock_ffmpeg):
         """Test failed MP3 to WAV conversion."""
@@ -108,6 +117,61 @@ class TestAudioProcessor(unittest.TestCase):
         result = processor.convert_mp3_to_wav("test.mp3")
         
         self.assertIsNone(result)
+    
+    @patch('audio_processor.av')
+    def test_convert_mp3_to_wav_with_pyav(self, mock_av):
+        """Test in-process conversion through PyAV."""
+        processor = AudioProcessor(str(self.input_dir), str(self.output_dir))
+        
+        # Two decoded frames, plus one frame flushed from the resampler
+        frames = [np.arange(4, dtype=np.int16).reshape(1, -1) for _ in range(3)]
+        mock_frames = [MagicMock(**{'to_ndarray.return_value': f}) for f in frames]
+        container = mock_av.open.return_value.__enter__.return_value
+        container.duration = None
+        container.decode.return_value = [MagicMock(), MagicMock()]
+        mock_av.AudioResampler.return_value.resample.side_effect = [
+            [mock_frames[0]], [mock_frames[1]], [mock_frames[2]]
+        ]
+        
+        result = processor.convert_mp3_to_wav("test.mp3")
+        
+        self.assertIsNotNone(result)
+        mock_av.AudioResampler.assert_called_once_with(format='s16', layout='mono', rate=16000)
+        with wave.open(result, 'rb') as wav_file:
+            self.assertEqual(wav_file.getframerate(), 16000)
+            self.assertEqual(wav_file.getnchannels(), 1)
+            self.assertEqual(wav_file.getnframes(), 12)
+        
+        # Decoded samples are handed to transcription without re-reading the WAV
+        samples = processor.get_audio_samples(result)
+        self.assertEqual(samples.dtype, np.float32)
+        self.assertEqual(samples.size, 12)
+    
+    def test_get_audio_samples_from_wav(self):
+        """Test reading converted WAV samples as float32 for Whisper."""
+        processor = AudioProcessor(str(self.input_dir), str(self.output_dir))
+        
+        wav_path = self.output_dir / "test_converted.wav"
+        processor._write_wav(wav_path, np.array([0, 16384, -32768], dtype=np.int16))
+        
+        samples = processor.get_audio_samples(str(wav_path))
+        
+        self.assertEqual(samples.dtype, np.float32)
+        np.testing.assert_allclose(samples, [0.0, 0.5, -1.0])
+    
+    def test_get_audio_info_from_wav_header(self):
+        """Test that audio info is read from the WAV header."""
+        processor = AudioProcessor(str(self.input_dir), str(self.output_dir))
+        
+        wav_path = self.output_dir / "test_converted.wav"
+        processor._write_wav(wav_path, np.zeros(8000, dtype=np.int16))
+        
+        info = processor.get_audio_info(str(wav_path))
+        
+        self.assertEqual(info['duration_seconds'], 0.5)
+        self.assertEqual(info['sample_rate'], 16000)
+        self.assertEqual(info['channels'], 1)
+        self.assertEqual(info['frame_width'], 2)
 
 
 if __name__ == '__main__':
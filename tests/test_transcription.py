@@ -0,0 +1,207 @@
+"""
+Test Transcription Module
+
+Tests for voice activity detection, chunked transcription and the
+transcription cache, run on synthetic audio with the Whisper model mocked out.
+"""
+
+import pytest
+import tempfile
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+pytest.importorskip("whisper")
+
+from constants import SAMPLE_RATE, VAD_FRAME_MS, VAD_SPEECH_PAD_MS, TRANSCRIPTION_CHUNK_SECONDS
+from transcription import TranscriptionEngine, _detect_speech_spans, _stitch_text
+
+FRAME_SAMPLES = SAMPLE_RATE * VAD_FRAME_MS // 1000
+PAD_SAMPLES = SAMPLE_RATE * VAD_SPEECH_PAD_MS // 1000
+
+
+def tone(seconds, frequency=440.0, amplitude=0.5):
+    """Generate a float32 sine tone standing in for speech."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def silence(seconds):
+    """Generate float32 digital silence."""
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def write_wav(path, audio):
+    """Write float32 samples as a 16-bit mono WAV file and return its path."""
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes((audio * 32767).astype('<i2').tobytes())
+    return str(path)
+
+
+class TestSpeechDetection:
+    """Test cases for energy-based voice activity detection."""
+
+    def test_detect_speech_spans(self):
+        """Test that tones separated by long silences become padded speech spans."""
+        audio = np.concatenate([silence(2), tone(1), silence(2), tone(1), silence(1)])
+
+        spans = _detect_speech_spans(audio)
+
+        assert len(spans) == 2
+        for (start, end), (speech_start, speech_end) in zip(spans, [(2, 3), (5, 6)]):
+            assert abs(start - (speech_start * SAMPLE_RATE - PAD_SAMPLES)) <= FRAME_SAMPLES
+            assert abs(end - (speech_end * SAMPLE_RATE + PAD_SAMPLES)) <= FRAME_SAMPLES
+
+    def test_short_pause_is_bridged(self):
+        """Test that a pause shorter than the minimum silence stays inside one span."""
+        audio = np.concatenate([silence(1), tone(1), silence(0.2), tone(1), silence(1)])
+
+        assert len(_detect_speech_spans(audio)) == 1
+
+    def test_silence_has_no_speech(self):
+        """Test that digital silence yields no speech spans."""
+        assert _detect_speech_spans(silence(3)) == []
+
+
+class TestStitchText:
+    """Test cases for joining the texts of overlapping chunks."""
+
+    def test_repeated_boundary_words_are_dropped(self):
+        """Test that words repeated across the overlap appear once, ignoring case and punctuation."""
+        assert _stitch_text("we walked to the", "The market, today") == "we walked to the market, today"
+        assert _stitch_text("one two three", "two three four") == "one two three four"
+
+    def test_texts_without_overlap_are_joined(self):
+        """Test that texts without repeated words are joined unchanged."""
+        assert _stitch_text("", "first chunk") == "first chunk"
+        assert _stitch_text("first chunk", "second chunk") == "first chunk second chunk"
+
+
+class TestTranscriptionEngine:
+    """Test cases for TranscriptionEngine with the model mocked out."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.engine = TranscriptionEngine(output_dir=self.temp_dir, backend="whisper")
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_transcribe_speech_only_maps_times_to_original_audio(self):
+        """Test that silence is cut before decoding and segment times are mapped back."""
+        audio = np.concatenate([silence(2), tone(1), silence(2), tone(1), silence(1)])
+        spans = _detect_speech_spans(audio)
+        first_span_seconds = (spans[0][1] - spans[0][0]) / SAMPLE_RATE
+
+        # Segment times as Whisper reports them on the trimmed audio
+        trimmed_result = {
+            'text': ' first second',
+            'language': 'en',
+            'segments': [
+                {'start': 0.1, 'end': 0.9, 'text': ' first'},
+                {'start': first_span_seconds + 0.1, 'end': first_span_seconds + 0.9, 'text': ' second'}
+            ]
+        }
+        with patch.object(self.engine, '_transcribe_whisper', return_value=trimmed_result) as transcribe:
+            result = self.engine._transcribe_speech_only(audio)
+
+        (trimmed_audio,), _ = transcribe.call_args
+        assert len(trimmed_audio) == sum(end - start for start, end in spans)
+
+        first, second = result['segments']
+        assert first['start'] == pytest.approx(spans[0][0] / SAMPLE_RATE + 0.1)
+        assert first['end'] == pytest.approx(spans[0][0] / SAMPLE_RATE + 0.9)
+        assert second['start'] == pytest.approx(spans[1][0] / SAMPLE_RATE + 0.1)
+        assert second['end'] == pytest.approx(spans[1][0] / SAMPLE_RATE + 0.9)
+
+    @pytest.mark.parametrize("audio", [
+        silence(3),
+        tone(3, amplitude=0.004),
+        np.concatenate([silence(20), tone(0.2), silence(20)])
+    ], ids=["silent", "quiet", "mostly-silent"])
+    def test_transcribe_speech_only_falls_back_to_untrimmed_audio(self, audio):
+        """Test that audio with no or hardly any detected speech is transcribed untrimmed."""
+        untrimmed_result = {'text': ' quiet speech', 'language': 'en', 'segments': [{'start': 0.5, 'end': 2.5}]}
+        with patch.object(self.engine, '_transcribe_whisper', return_value=untrimmed_result) as transcribe:
+            result = self.engine._transcribe_speech_only(audio)
+
+        (sent_audio,), _ = transcribe.call_args
+        assert sent_audio is audio
+        assert result['segments'] == [{'start': 0.5, 'end': 2.5}]
+
+    def test_transcribe_chunked_deduplicates_overlap(self):
+        """Test that overlapping chunks are stitched without repeating boundary segments or words."""
+        engine = TranscriptionEngine(output_dir=self.temp_dir, backend="faster-whisper", chunk_workers=2)
+        chunk_samples = TRANSCRIPTION_CHUNK_SECONDS * SAMPLE_RATE
+
+        def transcribe_chunk(chunk):
+            if len(chunk) == chunk_samples:
+                segments = [
+                    {'start': 0.0, 'end': 27.0, 'text': ' one two three four'},
+                    {'start': 27.0, 'end': 29.8, 'text': ' five six'}
+                ]
+            else:
+                # The first segment lies before the middle of the overlap and belongs to chunk one
+                segments = [
+                    {'start': 0.0, 'end': 0.4, 'text': ' five'},
+                    {'start': 0.4, 'end': 1.4, 'text': ' Six, seven eight'}
+                ]
+            return {'text': ''.join(seg['text'] for seg in segments), 'language': 'en', 'segments': segments}
+
+        # 50 seconds split into chunks at 0s and 29s, overlapping by one second
+        with patch.object(engine, '_transcribe_faster_whisper', side_effect=transcribe_chunk) as transcribe:
+            result = engine._transcribe_chunked(silence(50))
+
+        assert transcribe.call_count == 2
+        assert result['text'] == "one two three four five six seven eight"
+        assert [seg['text'] for seg in result['segments']] == [' one two three four', ' five six', ' Six, seven eight']
+        assert [seg['id'] for seg in result['segments']] == [0, 1, 2]
+        assert result['segments'][2]['start'] == pytest.approx(29.4)
+
+    def test_transcription_cache_hit_and_miss(self):
+        """Test that identical WAV bytes reuse the cached transcription and different bytes do not."""
+        audio_path = write_wav(self.temp_path / "clip.wav", tone(1))
+        copy_path = write_wav(self.temp_path / "copy.wav", tone(1))
+        other_path = write_wav(self.temp_path / "other.wav", tone(1, frequency=880.0))
+        transcription = {'text': 'A transcribed sentence', 'language': 'en', 'segments': [], 'confidence_score': 0.0}
+
+        with patch.object(TranscriptionEngine, 'load_model', return_value=True), \
+                patch.object(TranscriptionEngine, 'transcribe_audio',
+                             side_effect=lambda path, audio=None: dict(transcription, audio_path=path)) as transcribe:
+            first = self.engine.process_audio_file(audio_path)
+
+            # A new engine reads the on-disk cache, and a renamed copy of the same audio hits it
+            other_engine = TranscriptionEngine(output_dir=self.temp_dir, backend="whisper")
+            cached = other_engine.process_audio_file(copy_path)
+            assert transcribe.call_count == 1
+            assert cached['text'] == first['text']
+            assert cached['audio_path'] == copy_path
+
+            assert other_engine.process_audio_file(other_path) is not None
+            assert transcribe.call_count == 2
+
+    def test_cache_key_depends_on_device_and_precision(self):
+        """Test that transcriptions from different devices or precisions are cached separately."""
+        audio_path = write_wav(self.temp_path / "clip.wav", tone(1))
+        self.engine.device, self.engine.fp16 = "cpu", False
+        cpu_key = self.engine._cache_key(audio_path)
+
+        self.engine.device = "cuda"
+        cuda_fp32_key = self.engine._cache_key(audio_path)
+        self.engine.fp16 = True
+        cuda_fp16_key = self.engine._cache_key(audio_path)
+
+        assert len({cpu_key, cuda_fp32_key, cuda_fp16_key}) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
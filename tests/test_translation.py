@@ -7,31 +7,43 @@ Tests for the translation functionality using googletrans.
 import pytest
 import tempfile
 import os
+import re
+import json
 from pathlib import Path
-import sys
-
-# Add src directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from unittest.mock import MagicMock, patch
 
 from translation import TranslationEngine
 
 
+class FakeTranslator:
+    """Offline stand-in for googletrans.Translator that tags each text."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def translate(self, text, src='en', dest='ta'):
+        self.calls.append(text)
+        return MagicMock(text=f"தமிழ் {text}")
+
+
 class TestTranslationEngine:
     """Test cases for TranslationEngine."""
     
     def setup_method(self):
         """Set up test environment."""
         self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
         self.translation_engine = TranslationEngine(output_dir=self.temp_dir)
     
     def teardown_method(self):
         """Clean up test environment."""
         import shutil
+        self.translation_engine.close()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_translation_engine_initialization(self):
         """Test translation engine initialization."""
-        assert self.translation_engine.output_dir == Path(self.temp_dir)
+        assert self.translation_engine.output_dir == self.temp_path
         assert self.translation_engine.translator is None
     
     def test_load_translator(self):
@@ -71,6 +83,104 @@ class TestTranslationEngine:
         assert result['source_language'] == 'en'
         assert result['target_language'] == 'ta'
     
+    def test_translation_cache(self):
+        """Test that repeated translations are served from the cache."""
+        self.translation_engine.translator = MagicMock()
+        self.translation_engine.translator.translate.return_value = MagicMock(text='வணக்கம்')
+        
+        first = self.translation_engine.translate_text("Hello")
+        second = self.translation_engine.translate_text("Hello")
+        
+        assert self.translation_engine.translator.translate.call_count == 1
+        assert second['translated_text'] == first['translated_text']
+        assert second['cached'] is True
+        
+        # A new engine on the same output directory reads the on-disk cache
+        other_engine = TranslationEngine(output_dir=self.temp_dir)
+        other_engine.translator = MagicMock()
+        assert other_engine.translate_text("Hello")['translated_text'] == 'வணக்கம்'
+        other_engine.translator.translate.assert_not_called()
+        other_engine.close()
+    
+    def test_cached_translation_skips_validation(self):
+        """Test that a cached translation which passed validation is not re-validated."""
+        self.translation_engine.translator = MagicMock()
+        self.translation_engine.translator.translate.return_value = MagicMock(text='வணக்கம் உலகம்')
+        
+        assert self.translation_engine.process_text("Hello world", "validated") is not None
+        
+        # A new engine on the same output directory reads the validation from disk
+        other_engine = TranslationEngine(output_dir=self.temp_dir)
+        other_engine.translator = MagicMock()
+        second = other_engine.translate_text("Hello world")
+        with patch('translation._TAMIL_RE', re.compile(r'(?!)')):
+            assert other_engine.validate_translation(second) is True
+        other_engine.close()
+        assert '_validated' not in second
+    
+    def test_saved_json_omits_internal_keys(self):
+        """Test that cache bookkeeping flags are not written to the detailed JSON."""
+        self.translation_engine.translator = MagicMock()
+        self.translation_engine.translator.translate.return_value = MagicMock(text='வணக்கம் உலகம்')
+        
+        self.translation_engine.process_text("Hello world", "internal")
+        result = self.translation_engine.process_text("Hello world", "internal")
+        assert result['cached'] is True
+        
+        saved = json.loads((self.temp_path / "internal_translation_detailed.json").read_text(encoding='utf-8'))
+        assert saved['translated_text'] == 'வணக்கம் உலகம்'
+        assert not {'cached', '_validated'} & saved.keys()
+    
+    def test_stale_validation_is_rechecked(self):
+        """Test that a validation recorded under older rules is checked again."""
+        self.translation_engine.translator = MagicMock()
+        self.translation_engine.translator.translate.return_value = MagicMock(text='Héllo wörld')
+        self.translation_engine.translate_text("Hello world")
+        
+        # Key recorded before validation rules were versioned, when any non-ASCII text passed
+        stale_key = self.translation_engine._cache_key("Hello world\0Héllo wörld", 'en', 'ta')
+        self.translation_engine._store_validation(stale_key)
+        
+        result = self.translation_engine.translate_text("Hello world")
+        assert result['cached'] is True
+        assert self.translation_engine.validate_translation(result) is False
+        assert self.translation_engine.process_text("Hello world", "stale") is None
+    
+    def test_translate_deduplicates_sentences(self):
+        """Test that repeated sentences are translated once and reassembled in order."""
+        self.translation_engine.translator = MagicMock()
+        self.translation_engine.translator.translate.side_effect = lambda text, src, dest: MagicMock(text=f"[{text}]")
+        
+        result = self.translation_engine.translate_text("Hi there. Thanks!  Hi there.")
+        
+        translated = sorted(call.args[0] for call in self.translation_engine.translator.translate.call_args_list)
+        assert translated == ["Hi there.", "Thanks!"]
+        assert result['translated_text'] == "[Hi there.] [Thanks!]  [Hi there.]"
+    
+    def test_deep_translator_backend_batches_sentences(self):
+        """Test that the deep_translator backend translates all uncached sentences in one batch."""
+        engine = TranslationEngine(output_dir=self.temp_dir, backend="deep_translator")
+        engine.translator = MagicMock()
+        engine.translator.translate_batch.side_effect = lambda texts: [f"<{text}>" for text in texts]
+        
+        result = engine.translate_text("Hi there. Thanks!")
+        engine.close()
+        
+        engine.translator.translate_batch.assert_called_once_with(["Hi there.", "Thanks!"])
+        assert result['translated_text'] == "<Hi there.> <Thanks!>"
+    
+    def test_load_translator_uses_factory(self):
+        """Test that an injected translator factory replaces the googletrans translator."""
+        engine = TranslationEngine(output_dir=self.temp_dir, translator_factory=FakeTranslator)
+        assert engine.load_translator() is True
+        assert isinstance(engine.translator, FakeTranslator)
+        
+        result = engine.process_text("Hello world.", "factory")
+        engine.close()
+        
+        assert engine.translator.calls == ["Hello world."]
+        assert result['translated_text'] == "தமிழ் Hello world."
+    
     def test_save_translation(self):
         """Test saving translation results."""
         # Load translator
@@ -91,8 +201,8 @@ class TestTranslationEngine:
         assert success is True
         
         # Check if files were created
-        txt_file = Path(self.temp_dir) / "test_translation.txt"
-        json_file = Path(self.temp_dir) / "test_translation_detailed.json"
+        txt_file = self.temp_path / "test_translation.txt"
+        json_file = self.temp_path / "test_translation_detailed.json"
         
         assert txt_file.exists()
         assert json_file.exists()
@@ -102,6 +212,38 @@ class TestTranslationEngine:
             content = f.read()
             assert content == 'வணக்கம் உலகம்'
     
+    def test_save_translation_skips_unchanged_files(self):
+        """Test that saving identical results again leaves the files untouched."""
+        translation_result = {
+            'original_text': 'Hello world',
+            'translated_text': 'வணக்கம் உலகம்',
+            'source_language': 'en',
+            'target_language': 'ta',
+            'translation_timestamp': '2025-01-01T00:00:00'
+        }
+        txt_file = self.temp_path / "unchanged_translation.txt"
+        json_file = self.temp_path / "unchanged_translation_detailed.json"
+        
+        assert self.translation_engine.save_translation(translation_result, "unchanged") is True
+        os.utime(txt_file, ns=(0, 0))
+        os.utime(json_file, ns=(0, 0))
+        
+        assert self.translation_engine.save_translation(translation_result, "unchanged") is True
+        assert txt_file.stat().st_mtime_ns == 0
+        assert json_file.stat().st_mtime_ns == 0
+        
+        # A re-run produces a new timestamp but the same translation
+        rerun_result = dict(translation_result, translation_timestamp='2025-01-02T00:00:00')
+        assert self.translation_engine.save_translation(rerun_result, "unchanged") is True
+        assert txt_file.stat().st_mtime_ns == 0
+        assert json_file.stat().st_mtime_ns == 0
+        
+        # A changed translation is written
+        changed_result = dict(translation_result, translated_text='வணக்கம் நண்பரே')
+        assert self.translation_engine.save_translation(changed_result, "unchanged") is True
+        assert json_file.stat().st_mtime_ns != 0
+        assert json.loads(json_file.read_text(encoding='utf-8'))['translated_text'] == 'வணக்கம் நண்பரே'
+    
     def test_validate_translation(self):
         """Test translation validation."""
         # Valid translation
@@ -131,6 +273,13 @@ class TestTranslationEngine:
             'translated_text': 'Hi'
         }
         assert self.translation_engine.validate_translation(invalid_result3) is False
+        
+        # Invalid translation - non-ASCII but not Tamil
+        invalid_result4 = {
+            'original_text': 'Hello world',
+            'translated_text': 'Héllo wörld'
+        }
+        assert self.translation_engine.validate_translation(invalid_result4) is False
     
     def test_process_text_pipeline(self):
         """Test complete translation pipeline."""
@@ -147,8 +296,8 @@ class TestTranslationEngine:
         assert len(result['translated_text']) > 0
         
         # Check if files were created
-        txt_file = Path(self.temp_dir) / "pipeline_test_translation.txt"
-        json_file = Path(self.temp_dir) / "pipeline_test_translation_detailed.json"
+        txt_file = self.temp_path / "pipeline_test_translation.txt"
+        json_file = self.temp_path / "pipeline_test_translation_detailed.json"
         
         assert txt_file.exists()
         assert json_file.exists()
@@ -1,77 +1,120 @@
 """
 Test TTS Module
 
-Tests for the text-to-speech functionality using gTTS.
+Tests for the text-to-speech functionality using gTTS. gTTS is faked by
+tests/conftest.py; tests marked integration call the live service.
 """
 
 import pytest
-import tempfile
+import json
 import os
 from pathlib import Path
-import sys
-
-# Add src directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from unittest.mock import MagicMock, patch
 
 from tts import TTSEngine
+from tests.conftest import TAMIL_TTS_TEXTS
+
+# Keys every TTS result must contain
+REQUIRED_KEYS = frozenset({'original_text', 'audio_file_path', 'audio_filename', 'language_code', 'audio_format'})
+
+
+@pytest.fixture(scope="module")
+def tts_engine(tmp_path_factory):
+    """TTS engine shared by tests in this module that write no output."""
+    return TTSEngine(output_dir=str(tmp_path_factory.mktemp("tts_engine")))
 
 
 class TestTTSEngine:
     """Test cases for TTSEngine."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
+    @pytest.fixture(autouse=True)
+    def setup_tts_engine(self, tmp_path):
+        """Set up test environment in pytest's per-test tmp_path (cleaned up by pytest)."""
+        self.temp_path = tmp_path
+        self.temp_dir = str(tmp_path)
         self.tts_engine = TTSEngine(output_dir=self.temp_dir)
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_tts_engine_initialization(self):
         """Test TTS engine initialization."""
-        assert self.tts_engine.output_dir == Path(self.temp_dir)
+        assert self.tts_engine.output_dir == self.temp_path
     
-    def test_generate_speech_simple_text(self):
-        """Test simple Tamil text to speech generation."""
-        tamil_text = "வணக்கம் உலகம்"
-        result = self.tts_engine.generate_speech(tamil_text, "test_speech")
+    @pytest.mark.parametrize("name", TAMIL_TTS_TEXTS)
+    def test_generate_speech(self, tamil_tts_samples, name):
+        """Test Tamil text to speech generation for short and multi-sentence text."""
+        result = tamil_tts_samples[name]
         
         assert result is not None
-        assert 'original_text' in result
-        assert 'audio_file_path' in result
-        assert 'audio_filename' in result
-        assert result['original_text'] == tamil_text
+        assert REQUIRED_KEYS <= result.keys()
+        assert result['original_text'] == TAMIL_TTS_TEXTS[name]
         assert result['language_code'] == 'ta'
         assert result['audio_format'] == 'mp3'
         
-        # Check if audio file was created
+        # Check if audio file was created (its size is fixed by the gTTS fake;
+        # the integration tests check that live audio is more than 1KB)
         audio_path = Path(result['audio_file_path'])
-        assert audio_path.exists()
+        assert audio_path.is_file()
         assert audio_path.suffix == '.mp3'
-        assert audio_path.stat().st_size > 1024  # More than 1KB
     
-    def test_generate_speech_long_text(self):
-        """Test longer Tamil text to speech generation."""
+    @pytest.mark.integration
+    def test_generate_speech_live(self, live_tamil_tts_samples):
+        """Test that the live gTTS service returns real audio for the sample texts."""
+        for result in live_tamil_tts_samples.values():
+            assert result is not None
+            assert Path(result['audio_file_path']).stat().st_size > 1024
+    
+    def test_generate_speech_cache(self):
+        """Test that identical text is served from the speech cache."""
+        fake_gtts = MagicMock()
+        fake_gtts.return_value.write_to_fp.side_effect = lambda fp: fp.write(b'\xff\xfb' * 1024)
+        
+        with patch('tts._get_gtts_cls', return_value=fake_gtts):
+            first = self.tts_engine.generate_speech("வணக்கம் உலகம்", "first")
+            second = self.tts_engine.generate_speech("வணக்கம் உலகம்", "second")
+        
+        assert fake_gtts.call_count == 1
+        assert Path(second['audio_file_path']).read_bytes() == Path(first['audio_file_path']).read_bytes()
+        assert len(list((self.temp_path / ".tts_cache").glob("*.mp3"))) == 1
+    
+    def test_generate_speech_concurrent_sentences(self):
+        """Test that multi-sentence text is synthesized per sentence and joined in order."""
+        fake_gtts = MagicMock()
+        fake_gtts.side_effect = lambda text, lang, slow: MagicMock(
+            write_to_fp=lambda fp: fp.write(text.encode('utf-8') * 200)
+        )
+        
         tamil_text = "இது ஒரு நீண்ட உரை ஆகும். இது பல வாக்கியங்களைக் கொண்டுள்ளது."
-        result = self.tts_engine.generate_speech(tamil_text, "test_long_speech")
+        with patch('tts._get_gtts_cls', return_value=fake_gtts):
+            result = self.tts_engine.generate_speech(tamil_text, "sentences")
         
-        assert result is not None
-        assert len(result['original_text']) > 0
-        assert result['language_code'] == 'ta'
+        assert fake_gtts.call_count == 2
+        expected = "இது ஒரு நீண்ட உரை ஆகும்.".encode('utf-8') * 200 + "இது பல வாக்கியங்களைக் கொண்டுள்ளது.".encode('utf-8') * 200
+        assert Path(result['audio_file_path']).read_bytes() == expected
+    
+    @pytest.mark.parametrize("tamil_text,expected_chunks", [
+        ("வணக்கம். ... சரி!", ["வணக்கம். ...", "சரி!"]),
+        ("... வணக்கம். சரி!", ["... வணக்கம்.", "சரி!"]),
+        ("வணக்கம். ...", ["வணக்கம். ..."])
+    ])
+    def test_generate_speech_skips_punctuation_only_sentences(self, tamil_text, expected_chunks):
+        """Test that punctuation-only pieces are not sent to gTTS as separate requests."""
+        def fake_gtts(text, lang, slow):
+            # gTTS raises the same way when given nothing to speak
+            assert any(char.isalnum() for char in text), "No text to send to TTS API"
+            return MagicMock(write_to_fp=lambda fp: fp.write(b'\xff\xfb' * 1024))
         
-        # Check if audio file was created
-        audio_path = Path(result['audio_file_path'])
-        assert audio_path.exists()
-        assert audio_path.stat().st_size > 1024
+        with patch('tts._get_gtts_cls', return_value=MagicMock(side_effect=fake_gtts)) as get_gtts_cls:
+            result = self.tts_engine.generate_speech(tamil_text, "punctuation")
+        
+        assert result is not None
+        sent = sorted(call.kwargs['text'] for call in get_gtts_cls.return_value.call_args_list)
+        assert sent == sorted(expected_chunks)
     
     def test_save_tts_metadata(self):
         """Test saving TTS metadata."""
         # Create mock TTS result
         tts_result = {
             'original_text': 'வணக்கம் உலகம்',
-            'audio_file_path': str(Path(self.temp_dir) / 'test.mp3'),
+            'audio_file_path': str(self.temp_path / 'test.mp3'),
             'audio_filename': 'test.mp3',
             'language_code': 'ta',
             'text_length': 12,
@@ -79,21 +122,27 @@ class TestTTSEngine:
             'audio_format': 'mp3'
         }
         
+        # Check the serialized metadata without touching disk
+        metadata = self.tts_engine.serialize_tts_metadata(tts_result)
+        assert metadata['language_code'] == 'ta'
+        assert metadata == tts_result
+        
         # Save metadata
         success = self.tts_engine.save_tts_metadata(tts_result, "test")
         
         assert success is True
         
-        # Check if metadata file was created
-        metadata_file = Path(self.temp_dir) / "test_metadata.json"
-        assert metadata_file.exists()
+        # Check if metadata file was created with the serialized metadata
+        metadata_file = self.temp_path / "test_metadata.json"
+        assert json.loads(metadata_file.read_text(encoding='utf-8')) == metadata
     
     def test_validate_tts_result(self):
         """Test TTS result validation."""
-        # Create a temporary audio file for testing
-        audio_file = Path(self.temp_dir) / "test_audio.mp3"
-        with open(audio_file, 'wb') as f:
-            f.write(b'fake audio data' * 100)  # Create a file with some content
+        # Create a temporary audio file for testing; validation only checks its size,
+        # so a sparse file without data blocks is enough
+        audio_file = self.temp_path / "test_audio.mp3"
+        audio_file.touch()
+        os.truncate(audio_file, 2048)
         
         # Valid TTS result
         valid_result = {
@@ -119,9 +168,21 @@ class TestTTSEngine:
         # Invalid TTS result - non-existent audio file
         invalid_result3 = {
             'original_text': 'வணக்கம் உலகம்',
-            'audio_file_path': str(Path(self.temp_dir) / "nonexistent.mp3")
+            'audio_file_path': str(self.temp_path / "nonexistent.mp3")
         }
         assert self.tts_engine.validate_tts_result(invalid_result3) is False
+        
+        # Invalid TTS result - audio path that cannot be stat'ed
+        invalid_result4 = {
+            'original_text': 'வணக்கம் உலகம்',
+            'audio_file_path': str(audio_file / "nested.mp3")
+        }
+        assert self.tts_engine.validate_tts_result(invalid_result4) is False
+        
+        # Valid TTS result - symlinked audio is checked by the size of its target
+        linked_file = self.temp_path / "linked_audio.mp3"
+        linked_file.symlink_to(audio_file)
+        assert self.tts_engine.validate_tts_result({**valid_result, 'audio_file_path': str(linked_file)}) is True
     
     def test_process_text_pipeline(self):
         """Test complete TTS pipeline."""
@@ -129,27 +190,23 @@ class TestTTSEngine:
         result = self.tts_engine.process_text(tamil_text, "pipeline_test")
         
         assert result is not None
-        assert 'original_text' in result
-        assert 'audio_file_path' in result
+        assert REQUIRED_KEYS <= result.keys()
         assert result['language_code'] == 'ta'
         
         # Check if files were created
         audio_path = Path(result['audio_file_path'])
-        metadata_file = Path(self.temp_dir) / "pipeline_test_metadata.json"
+        metadata_file = self.temp_path / "pipeline_test_metadata.json"
         
-        assert audio_path.exists()
+        assert audio_path.is_file()
         assert metadata_file.exists()
-        assert audio_path.stat().st_size > 1024
-    
-    def test_empty_text_handling(self):
-        """Test handling of empty text input."""
-        result = self.tts_engine.generate_speech("", "empty_test")
-        assert result is None
-    
-    def test_whitespace_text_handling(self):
-        """Test handling of whitespace-only text input."""
-        result = self.tts_engine.generate_speech("   ", "whitespace_test")
-        assert result is None
+
+
+# Outside TestTTSEngine so its per-test engine setup does not run for each case
+@pytest.mark.parametrize("bad_text", ["", "   ", "\n\t", None])
+def test_invalid_text_handling(tts_engine, bad_text):
+    """Test handling of empty, whitespace-only and missing text input."""
+    result = tts_engine.generate_speech(bad_text, "invalid_test")
+    assert result is None
 
 
 if __name__ == "__main__":